@@ -0,0 +1,279 @@
+"""Headless latency benchmark for the dashboards at scaled data sizes.
+
+Synthetic FPI, bond-yield and FX inputs are generated at multiples of the
+shipped FPI_Data.csv row count. The data.py callback is then called directly,
+and bond.py, inr.py and jpy.py are driven through Streamlit's AppTest. For
+each interaction the p50/p95 latency, payload bytes and peak RSS are
+recorded. For data.py the payload is everything the callback exchanges with
+the browser: the State it receives plus the whole output tuple. Each (dashboard, scale) pair runs in its own subprocess so memory
+figures do not bleed between runs.
+
+    python bench_dashboards.py --scales 1 10 100 --out bench_results.json
+    python bench_dashboards.py --compare bench_results.json   # rerun and diff
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_FILE = os.path.join(REPO_DIR, "FPI_Data.csv")
+TARGETS = ["data", "bond", "inr", "jpy"]
+BASE_SECTORS = 40
+
+
+class PeakRss:
+    """Samples this process's RSS on a thread while the block runs; .peak is in bytes"""
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        try:
+            import psutil
+            self._read = psutil.Process().memory_info
+        except ImportError:
+            self._read = None
+
+    def _rss(self):
+        if self._read is not None:
+            return self._read().rss
+        # Without psutil fall back to the process-lifetime peak
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._rss())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.peak = self._rss()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._rss())
+        return False
+
+
+def base_rows():
+    try:
+        return len(pd.read_csv(BASE_FILE))
+    except FileNotFoundError:
+        return 4640
+
+
+def write_synthetic_data(workdir, scale, seed=0):
+    """Write every input the dashboards read, sized at scale x FPI_Data.csv"""
+    rng = np.random.default_rng(seed)
+    n_sectors = BASE_SECTORS * math.ceil(math.sqrt(scale))
+    n_dates = math.ceil(base_rows() * scale / n_sectors)
+
+    # Fortnight ends (15th and month end) from 2000 on; %y stays unambiguous to 2068
+    months = pd.date_range("2000-01-01", periods=math.ceil(n_dates / 2), freq="MS")
+    dates = pd.DatetimeIndex(sorted(list(months + pd.Timedelta(days=14)) + list(months + pd.offsets.MonthEnd(0))))[:n_dates]
+    date_str = dates.strftime("%d-%b-%y")
+    sectors = [f"Sector {i:03d}" for i in range(n_sectors)]
+
+    auc = np.abs(rng.normal(50000, 20000, n_sectors))[None, :] * np.cumprod(
+        1 + rng.normal(0.002, 0.03, (n_dates, n_sectors)), axis=0)
+    sector_frame = pd.DataFrame({
+        "Date": np.repeat(date_str, n_sectors),
+        "Sector": np.tile(sectors, n_dates),
+        "AUC as on Date": auc.round().ravel(),
+    })
+    sector_frame.to_csv(os.path.join(workdir, "fpi_dash.csv"), index=False)
+
+    sector_frame["Net FPI Change"] = rng.normal(0, 500, len(sector_frame)).round()
+    sector_frame[["Date", "Sector", "Net FPI Change"]].to_csv(
+        os.path.join(workdir, "Cleaned_FPI_Data_Formatted.csv"), index=False)
+
+    pd.DataFrame({"observation_date": date_str, "T10Y2Y": rng.normal(0.5, 0.6, n_dates).round(2)}).to_csv(
+        os.path.join(workdir, "T10Y2Y_Formatted.csv"), index=False)
+    pd.DataFrame({"Date": date_str, "Net FPI Change": rng.normal(0, 8000, n_dates).round()}).to_csv(
+        os.path.join(workdir, "Fortnightly_Total_FPI.csv"), index=False)
+    pd.DataFrame({"Date": date_str, "Fortnight Return (%)": rng.normal(0, 0.8, n_dates).round(3)}).to_csv(
+        os.path.join(workdir, "Formatted_Fortnightly_Returns_USD_INR.csv"), index=False)
+
+    for pair, level in (("JPY", 140.0), ("CNY", 7.1)):
+        close = level * np.cumprod(1 + rng.normal(0, 0.01, n_dates))
+        spread = np.abs(rng.normal(0, 0.005, n_dates)) * close
+        pd.DataFrame({
+            "Date": date_str, "Price": close, "Open": close + rng.normal(0, 0.5, n_dates) * spread,
+            "High": close + spread, "Low": close - spread,
+        }).to_csv(os.path.join(workdir, f"Fortnightly_Returns_USD_{pair}.csv"), index=False)
+
+    return {"sector_rows": len(sector_frame), "dates": n_dates, "sectors": n_sectors}
+
+
+def _timed(fn, repeats):
+    """Run fn repeats times; returns latencies (ms), last payload size and peak RSS"""
+    latencies, payload = [], 0
+    with PeakRss() as rss:
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            payload = fn()
+            latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies, payload, rss.peak
+
+
+def bench_dash(workdir, repeats):
+    """Interactions against the data.py update_chart callback"""
+    import plotly.io as pio
+    os.environ["FPI_DASH_CSV"] = os.path.join(workdir, "fpi_dash.csv")
+    sys.path.insert(0, REPO_DIR)
+    with PeakRss() as rss:
+        t0 = time.perf_counter()
+        import data
+        load_ms = (time.perf_counter() - t0) * 1000
+    yield "import_and_load", [load_ms], 0, rss.peak
+
+    dates = data.unique_dates
+    first, last = dates[0], dates[-1]
+    _, full_state = data.update_chart(first, last, None)
+
+    def call(start, end, state):
+        def run():
+            outputs = data.update_chart(start, end, state)
+            return len(pio.json.to_json_plotly(state)) + len(pio.json.to_json_plotly(list(outputs)))
+        return run
+
+    _, prev_state = data.update_chart(first, dates[-2], None)
+    _, late_state = data.update_chart(dates[len(dates) // 2], last, None)
+    interactions = {
+        "initial_render": call(first, last, None),
+        "end_date_back_one": call(first, dates[-2], full_state),
+        "end_date_forward_one": call(first, last, prev_state),
+        "start_date_change": call(first, last, late_state),
+    }
+    for name, run in interactions.items():
+        yield (name,) + _timed(run, repeats)
+
+
+def _chart_bytes(at):
+    return sum(len(el.proto.SerializeToString()) for el in at.get("plotly_chart"))
+
+
+def bench_streamlit(script, workdir, repeats):
+    """Full script reruns through AppTest, one per widget interaction"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    path = os.path.join(REPO_DIR, f"{script}.py")
+
+    def fresh_run():
+        # AppTest shares this process's st.cache_data; clear it so each run loads the CSVs
+        st.cache_data.clear()
+        at = AppTest.from_file(path, default_timeout=600)
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{script}.py raised: {at.exception[0].message}")
+        return _chart_bytes(at)
+    yield ("initial_run",) + _timed(fresh_run, repeats)
+
+    at = AppTest.from_file(path, default_timeout=600)
+    at.run()
+    boxes = at.sidebar.selectbox
+    for box_index, box in enumerate(boxes):
+        n_options = len(box.options)
+        counter = iter(range(1, 10 ** 9))  # start at 1 so the first select changes the value
+
+        def select_next(box_index=box_index, n_options=n_options, counter=counter):
+            at.sidebar.selectbox[box_index].select_index(next(counter) % n_options).run()
+            return _chart_bytes(at)
+        yield (box.label.lower().replace(" ", "_"),) + _timed(select_next, repeats)
+
+
+def run_worker(target, scale, repeats):
+    """Benchmark one dashboard at one scale and print JSON records to stdout"""
+    with tempfile.TemporaryDirectory(prefix=f"fpi_bench_{target}_{scale}x_", ignore_cleanup_errors=True) as workdir:
+        sizes = write_synthetic_data(workdir, scale)
+        runs = bench_dash(workdir, repeats) if target == "data" else bench_streamlit(target, workdir, repeats)
+        for interaction, latencies, payload, peak in runs:
+            _emit(target, scale, sizes, interaction, latencies, payload, peak)
+        os.chdir(REPO_DIR)
+
+
+def _emit(target, scale, sizes, interaction, latencies, payload, peak):
+    print(json.dumps({
+        "target": target,
+        "scale": scale,
+        **sizes,
+        "interaction": interaction,
+        "runs": len(latencies),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "payload_bytes": payload,
+        "peak_rss_mb": round(peak / 2 ** 20, 1),
+    }), flush=True)
+
+
+def compare(results, baseline):
+    """Print p50 latency and payload ratios against an earlier results file"""
+    key = lambda r: (r["target"], r["scale"], r["interaction"])
+    before = {key(r): r for r in baseline}
+    print(f"\n{'target':<6} {'scale':>5} {'interaction':<28} {'p50 ms':>16} {'payload bytes':>24}")
+    for r in results:
+        old = before.get(key(r))
+        if old is None:
+            continue
+        print(f"{r['target']:<6} {r['scale']:>5} {r['interaction']:<28} "
+              f"{old['p50_ms']:>7.1f} -> {r['p50_ms']:<7.1f} {old['payload_bytes']:>10} -> {r['payload_bytes']:<10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard interactions at scaled data sizes")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--targets", nargs="+", default=TARGETS, choices=TARGETS)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--worker", nargs=2, metavar=("TARGET", "SCALE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker[0], int(args.worker[1]), args.repeats)
+        return
+
+    results = []
+    for scale in args.scales:
+        for target in args.targets:
+            print(f"Benchmarking {target} at {scale}x...")
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", target, str(scale),
+                 "--repeats", str(args.repeats)],
+                capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"❌ {target} at {scale}x failed:\n{proc.stderr.strip()[-2000:]}")
+                continue
+            for line in proc.stdout.splitlines():
+                if line.startswith("{"):
+                    record = json.loads(line)
+                    results.append(record)
+                    print(f"  {record['interaction']:<28} p50 {record['p50_ms']:>9.1f} ms  "
+                          f"p95 {record['p95_ms']:>9.1f} ms  {record['payload_bytes']:>10} B  "
+                          f"{record['peak_rss_mb']:>7.1f} MB")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            compare(results, json.load(fh))
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=1)
+    print(f"\n💾 Saved {len(results)} results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
 import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
+import perf
+
+rerun_stage = perf.stage("bond.streamlit_rerun").start()
 
 st.set_page_config(page_title="FPI & Bond Yield Dashboard", layout="wide")
 st.title("📊 FPI Net Change vs Bond Yield (T10Y2Y)")
 
 
-fpi_df = pd.read_csv("Cleaned_FPI_Data_Formatted.csv")
+with perf.stage("bond.load_csv") as load_stage:
+    fpi_df = pd.read_csv("Cleaned_FPI_Data_Formatted.csv")
+    load_stage.set_rows(len(fpi_df))
 fpi_df.columns = fpi_df.columns.str.lower().str.strip()
 
 
@@ -17,16 +22,22 @@ fpi_df.rename(columns={
 }, inplace=True)
 
 
-fpi_df['Date'] = pd.to_datetime(fpi_df['Date'], format="%d-%b-%y")
+with perf.stage("bond.parse_dates", rows=len(fpi_df)):
+    fpi_df['Date'] = pd.to_datetime(fpi_df['Date'], format="%d-%b-%y")
 
 
-yield_df = pd.read_csv("T10Y2Y_Formatted.csv")
+with perf.stage("bond.load_csv") as load_stage:
+    yield_df = pd.read_csv("T10Y2Y_Formatted.csv")
+    load_stage.set_rows(len(yield_df))
 yield_df.columns = yield_df.columns.str.lower().str.strip()
 yield_df.rename(columns={'observation_date': 'Date', 't10y2y': 'T10Y2Y'}, inplace=True)
-yield_df['Date'] = pd.to_datetime(yield_df['Date'], format="%d-%b-%y")
+with perf.stage("bond.parse_dates", rows=len(yield_df)):
+    yield_df['Date'] = pd.to_datetime(yield_df['Date'], format="%d-%b-%y")
 
 
-merged_df = pd.merge(fpi_df, yield_df, on='Date', how='inner')
+with perf.stage("bond.merge") as merge_stage:
+    merged_df = pd.merge(fpi_df, yield_df, on='Date', how='inner')
+    merge_stage.set_rows(len(merged_df))
 
 
 selected_sector = st.sidebar.selectbox("Select a sector", merged_df['Sector'].unique())
@@ -67,6 +78,8 @@ fig.update_layout(
 
 st.plotly_chart(fig, use_container_width=True)
 
+rerun_stage.stop(rows=len(sector_data))
+
 
 
 
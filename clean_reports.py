@@ -0,0 +1,193 @@
+"""Turn raw NSDL sector-wise reports into the *_cleaned.csv inputs for scraper.py.
+
+Each raw report (HTML or XLS/XLSX, as saved by fetch_reports.py) is parsed in a
+process pool. The Sector and AUC columns are located by matching the text of the
+multi-row header rather than by position, and the output is written as
+<YYYY-MM-DD>_cleaned.csv with named columns, so scraper.py can read the date
+straight from the file name.
+
+fixtures/nsdl_reports holds NSDL-style reports with a title row and
+rowspan/colspan headers in <th> and in <td> cells, under ISO and legacy names:
+
+    python clean_reports.py --raw-dir fixtures/nsdl_reports --out-dir /tmp/cleaned --force
+"""
+import os
+import re
+import glob
+import time
+import argparse
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+RAW_DIR = "raw_reports"
+OUT_DIR = "."
+
+SECTOR_PATTERN = r"sector"
+AUC_PATTERN = r"\bauc\b|assets\s+under\s+custody"
+# Within the AUC column group, prefer the equity sub-column when there is one
+AUC_SUBCOLUMN_PATTERN = r"equity"
+
+HEADER_SCAN_ROWS = 10
+
+# Placeholder pandas gives header cells that were empty or covered by a span
+_UNNAMED = re.compile(r"^Unnamed: \d+(_level_\d+)?$")
+
+_ISO_NAME = re.compile(r"(\d{4}-\d{2}-\d{2})")
+_LEGACY_NAME = re.compile(r"([A-Za-z]+)(\d{1,2})(\d{4})")
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+
+def report_date(path):
+    """Report date from a raw file name, ISO (2020-04-15) or NSDL style (April152020, JUNE152020)"""
+    name = os.path.basename(path)
+    match = _ISO_NAME.search(name)
+    if match:
+        return date.fromisoformat(match.group(1))
+    match = _LEGACY_NAME.search(name.split("_")[-1])
+    if match:
+        month = _MONTHS.get(match.group(1)[:3].lower())
+        if month:
+            return date(int(match.group(3)), month, int(match.group(2)))
+    raise ValueError(f"Cannot read a report date from {name}")
+
+
+def header_as_rows(table):
+    """Move column labels back into the body as leading rows.
+
+    read_html always turns leading <th> rows into (MultiIndex) column labels,
+    even with header=None, so the header text has to be pushed back into the
+    table before locate_columns can scan it.
+    """
+    columns = table.columns
+    if isinstance(columns, pd.MultiIndex):
+        levels = [columns.get_level_values(i) for i in range(columns.nlevels)]
+    elif list(columns) == list(range(len(columns))):
+        return table
+    else:
+        levels = [columns]
+    header = pd.DataFrame(
+        [[None if _UNNAMED.match(str(label)) else label for label in level] for level in levels])
+    body = table.set_axis(range(len(columns)), axis=1)
+    return pd.concat([header, body], ignore_index=True)
+
+
+def read_tables(path):
+    """All tables in a raw report, with header rows kept as plain rows"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xls", ".xlsx"):
+        sheets = pd.read_excel(path, sheet_name=None, header=None)
+        return list(sheets.values())
+    return [header_as_rows(table) for table in pd.read_html(path, header=None)]
+
+
+def _cell_text(value):
+    return "" if pd.isna(value) else re.sub(r"\s+", " ", str(value)).strip()
+
+
+def locate_columns(table, sector_pattern=SECTOR_PATTERN, auc_pattern=AUC_PATTERN,
+                   sub_pattern=AUC_SUBCOLUMN_PATTERN):
+    """Find (sector_col, auc_col, first_data_row) by header text, or None if no match.
+
+    Merged header cells come back repeated across the columns they span, so the
+    AUC group is every column whose stacked header text matches auc_pattern.
+    """
+    top = table.head(HEADER_SCAN_ROWS).map(_cell_text)
+    for header_row in range(len(top)):
+        row_text = [t for t in top.loc[header_row] if t]
+        if len(set(row_text)) <= 1:
+            continue  # blank row, or a title cell spanning the whole table
+        sector_cols = [c for c in top.columns if re.search(sector_pattern, top.at[header_row, c], re.I)]
+        if not sector_cols:
+            continue
+        sector_col = sector_cols[0]
+
+        # Header may continue for a few rows under the sector label
+        for last_header in range(header_row, min(header_row + 3, len(top))):
+            stacked = {c: " ".join(top.loc[header_row:last_header, c]) for c in top.columns}
+            auc_cols = [c for c in top.columns if c != sector_col and re.search(auc_pattern, stacked[c], re.I)]
+            if not auc_cols:
+                continue
+            preferred = [c for c in auc_cols if re.search(sub_pattern, stacked[c], re.I)] if sub_pattern else []
+            auc_col = (preferred or auc_cols)[0]
+
+            # Data starts at the first row below the header with a numeric AUC
+            values = pd.to_numeric(table[auc_col].astype(str).str.replace(",", ""), errors="coerce")
+            numeric_rows = values.index[(values.index > last_header) & values.notna()]
+            if len(numeric_rows):
+                return sector_col, auc_col, table.index.get_loc(numeric_rows[0])
+    return None
+
+
+def clean_report(path, out_dir=OUT_DIR, force=False):
+    """Clean one raw report; returns (path, status, detail)"""
+    try:
+        report_day = report_date(path)
+        out_path = os.path.join(out_dir, f"{report_day.isoformat()}_cleaned.csv")
+        if not force and os.path.exists(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(path):
+            return path, "up_to_date", out_path
+
+        for table in read_tables(path):
+            table = table.reset_index(drop=True)
+            found = locate_columns(table)
+            if found is None:
+                continue
+            sector_col, auc_col, first_row = found
+            body = table.iloc[first_row:]
+            cleaned = pd.DataFrame({
+                "Date": report_day.isoformat(),
+                "Sector": body[sector_col].map(_cell_text).to_numpy(),
+                "AUC as on Date": pd.to_numeric(body[auc_col].astype(str).str.replace(",", ""),
+                                                errors="coerce").to_numpy(),
+            })
+            cleaned = cleaned[cleaned["Sector"] != ""]
+            cleaned.to_csv(out_path, index=False)
+            return path, "cleaned", f"{out_path} ({len(cleaned)} rows)"
+        return path, "no_table", "no table with Sector and AUC headers"
+    except Exception as e:
+        return path, "error", str(e)
+
+
+def _clean_report_args(args):
+    return clean_report(*args)
+
+
+def clean_all(paths, out_dir=OUT_DIR, workers=None, force=False):
+    """Clean many reports across a process pool"""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(path, out_dir, force) for path in paths]
+    if workers == 1 or len(jobs) <= 1:
+        return [clean_report(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_clean_report_args, jobs, chunksize=max(1, len(jobs) // 32)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean raw NSDL sector-wise reports into *_cleaned.csv files")
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--out-dir", default=OUT_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-clean reports whose output is up to date")
+    args = parser.parse_args()
+
+    paths = sorted(p for ext in ("html", "htm", "xls", "xlsx")
+                   for p in glob.glob(os.path.join(args.raw_dir, f"*.{ext}")))
+    print(f"Cleaning {len(paths)} raw reports...")
+    t0 = time.perf_counter()
+    results = clean_all(paths, args.out_dir, args.workers, args.force)
+    elapsed = time.perf_counter() - t0
+
+    counts = {}
+    for path, status, detail in results:
+        counts[status] = counts.get(status, 0) + 1
+        if status in ("error", "no_table"):
+            print(f"⚠️ Skipping {os.path.basename(path)} ({detail})")
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    print(f"✅ Done in {elapsed:.1f}s: {summary}")
+
+
+if __name__ == "__main__":
+    main()
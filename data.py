@@ -1,15 +1,24 @@
 import dash
-from dash import dcc, html
+from dash import dcc, html, Patch
 import plotly.express as px
+import os
 import pandas as pd
+import perf
 
-file_path = r"C:\Users\ASUS\Downloads\fpi_dash.csv"
-df = pd.read_csv(file_path)
+file_path = os.environ.get("FPI_DASH_CSV", r"C:\Users\ASUS\Downloads\fpi_dash.csv")
+with perf.stage("data.load_csv") as load_stage:
+    df = pd.read_csv(file_path)
+    load_stage.set_rows(len(df))
 
-df["Date"] = pd.to_datetime(df["Date"], format="%d-%b-%y")
+with perf.stage("data.parse_dates", rows=len(df)):
+    df["Date"] = pd.to_datetime(df["Date"], format="%d-%b-%y")
 df["AUC as on Date"] = pd.to_numeric(df["AUC as on Date"], errors="coerce")
 unique_dates = sorted(df["Date"].unique())
 
+# Pivot once; each callback only slices the date range it needs
+full_pivot = df.pivot(index="Sector", columns="Date", values="AUC as on Date").apply(pd.to_numeric, errors="coerce")
+has_row = df.assign(_row=1).pivot(index="Sector", columns="Date", values="_row").notna()
+
 app = dash.Dash(__name__)
 app.layout = html.Div([
     html.H1("📊 FII/FPI AUC Change Heatmap", style={"textAlign": "center"}),
@@ -31,26 +40,91 @@ app.layout = html.Div([
     ),
 
     dcc.Graph(id="heatmap-chart"),
+    # Date range currently drawn; the server rebuilds its axes from the static data
+    dcc.Store(id="heatmap-state"),
 ])
 
+# Deleting a cell from the patched figure costs about 5x the bytes of resending it
+DELETE_COST_RATIO = 5
+
+def sectors_in_range(start_date, end_date):
+    """Boolean mask of sectors reported at least once in range"""
+    return has_row.loc[:, start_date:end_date].any(axis=1)
+
+def heatmap_axes(start_date, end_date):
+    """(dates, sectors) drawn for a range, as sent to the browser"""
+    dates = [d.isoformat() for d in full_pivot.loc[:, start_date:end_date].columns]
+    return dates, list(full_pivot.index[sectors_in_range(start_date, end_date)])
+
+def heatmap_matrix(start_date, end_date):
+    """AUC change against the first date in range, for sectors reported in range"""
+    pivot_df = full_pivot.loc[sectors_in_range(start_date, end_date), start_date:end_date]
+    return pivot_df.subtract(pivot_df.iloc[:, 0], axis=0)
+
+def matrix_rows(matrix):
+    """Plain nested lists (None for NaN) so the client-side figure can be patched in place"""
+    return matrix.astype(object).where(matrix.notna(), None).values.tolist()
+
+def chart_title(start_date, end_date):
+    return f"AUC Change from {start_date.strftime('%d-%b-%Y')} to {end_date.strftime('%d-%b-%Y')}"
+
 @app.callback(
-    dash.dependencies.Output("heatmap-chart", "figure"),
-    [dash.dependencies.Input("start-date", "value"), dash.dependencies.Input("end-date", "value")]
+    [dash.dependencies.Output("heatmap-chart", "figure"), dash.dependencies.Output("heatmap-state", "data")],
+    [dash.dependencies.Input("start-date", "value"), dash.dependencies.Input("end-date", "value")],
+    dash.dependencies.State("heatmap-state", "data"),
 )
-def update_chart(start_date, end_date):
+@perf.timed("data.update_chart")
+def update_chart(start_date, end_date, state):
     start_date, end_date = pd.to_datetime(start_date), pd.to_datetime(end_date)
-    filtered_df = df[(df["Date"] >= start_date) & (df["Date"] <= end_date)]
-    pivot_df = filtered_df.pivot(index="Sector", columns="Date", values="AUC as on Date").apply(pd.to_numeric, errors="coerce")
-    auc_change = pivot_df.iloc[:, -1] - pivot_df.iloc[:, 0]
-
-    fig = px.imshow(
-        pivot_df.subtract(pivot_df.iloc[:, 0], axis=0),
-        labels={"x": "Date", "y": "Sector", "color": "AUC Difference"},
-        color_continuous_scale="RdYlGn",
-        title=f"AUC Change from {start_date.strftime('%d-%b-%Y')} to {end_date.strftime('%d-%b-%Y')}"
-    )
-
-    return fig
+    matrix = heatmap_matrix(start_date, end_date)
+    dates = [d.isoformat() for d in matrix.columns]
+    sectors = list(matrix.index)
+    new_state = {"start": start_date.isoformat(), "end": end_date.isoformat()}
+
+    # First render: send the whole figure once
+    if state is None:
+        fig = px.imshow(
+            matrix,
+            labels={"x": "Date", "y": "Sector", "color": "AUC Difference"},
+            color_continuous_scale="RdYlGn",
+            title=chart_title(start_date, end_date)
+        )
+        # Set the arrays on the plain dict: plotly would pack numeric lists into
+        # binary arrays, which the browser cannot extend or delete from
+        figure = fig.to_dict()
+        figure["data"][0].update(x=dates, y=sectors, z=matrix_rows(matrix))
+        return figure, new_state
+
+    old_dates, old_sectors = heatmap_axes(pd.to_datetime(state["start"]), pd.to_datetime(state["end"]))
+    if dates == old_dates and sectors == old_sectors:
+        return dash.no_update, dash.no_update
+
+    patched = Patch()
+    patched["layout"]["title"]["text"] = chart_title(start_date, end_date)
+    heatmap = patched["data"][0]
+    same_base = sectors == old_sectors and dates[:1] == old_dates[:1]
+
+    if same_base and dates[:len(old_dates)] == old_dates:
+        # End date moved later: append the new columns to x and to every row
+        added = matrix.iloc[:, len(old_dates):]
+        heatmap["x"].extend(dates[len(old_dates):])
+        for i, row in enumerate(matrix_rows(added)):
+            heatmap["z"][i].extend(row)
+    elif (same_base and old_dates[:len(dates)] == dates
+          and (len(old_dates) - len(dates)) * DELETE_COST_RATIO < len(dates)):
+        # End date moved earlier: drop trailing columns, highest index first
+        # (unless enough columns go that resending the remainder below is smaller)
+        for col in range(len(old_dates) - 1, len(dates) - 1, -1):
+            del heatmap["x"][col]
+            for i in range(len(sectors)):
+                del heatmap["z"][i][col]
+    else:
+        # Start date moved: every value is rebased, but layout and colorscale stay put
+        heatmap["x"] = dates
+        heatmap["y"] = sectors
+        heatmap["z"] = matrix_rows(matrix)
+
+    return patched, new_state
 
 if __name__ == "__main__":
     app.run_server(debug=True)
@@ -0,0 +1,241 @@
+"""Vectorized lunar-phase and solar-longitude calendar.
+
+Full-moon (Purnima) and new-moon (Amavasya) instants come from the mean-phase
+series with periodic corrections in Meeus, "Astronomical Algorithms" (2nd ed.,
+ch. 49), good to about a minute. Solar longitude uses the low-precision solar
+theory from ch. 25 (about 0.01 degrees). Everything is evaluated for whole
+arrays at once with NumPy, and instants are returned in Asia/Kolkata time.
+"""
+import time
+import numpy as np
+import pandas as pd
+
+IST = 'Asia/Kolkata'
+
+ZODIAC_SIGNS = np.array([
+    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces',
+])
+
+_UNIX_EPOCH_JD = 2440587.5
+_SYNODIC_MONTH = 29.530588861
+
+# Meeus table 49.A: (coefficient, E power, M', M, F, Omega multipliers)
+_NEW_MOON_TERMS = [
+    (-0.40720, 0, 1, 0, 0, 0), (0.17241, 1, 0, 1, 0, 0), (0.01608, 0, 2, 0, 0, 0),
+    (0.01039, 0, 0, 0, 2, 0), (0.00739, 1, 1, -1, 0, 0), (-0.00514, 1, 1, 1, 0, 0),
+    (0.00208, 2, 0, 2, 0, 0), (-0.00111, 0, 1, 0, -2, 0), (-0.00057, 0, 1, 0, 2, 0),
+    (0.00056, 1, 2, 1, 0, 0), (-0.00042, 0, 3, 0, 0, 0), (0.00042, 1, 0, 1, 2, 0),
+    (0.00038, 1, 0, 1, -2, 0), (-0.00024, 1, 2, -1, 0, 0), (-0.00017, 0, 0, 0, 0, 1),
+    (-0.00007, 0, 1, 2, 0, 0), (0.00004, 0, 2, 0, -2, 0), (0.00004, 0, 0, 3, 0, 0),
+    (0.00003, 0, 1, 1, -2, 0), (0.00003, 0, 2, 0, 2, 0), (-0.00003, 0, 1, 1, 2, 0),
+    (0.00003, 0, 1, -1, 2, 0), (-0.00002, 0, 1, -1, -2, 0), (-0.00002, 0, 3, 1, 0, 0),
+    (0.00002, 0, 4, 0, 0, 0),
+]
+_FULL_MOON_TERMS = [
+    (-0.40614, 0, 1, 0, 0, 0), (0.17302, 1, 0, 1, 0, 0), (0.01614, 0, 2, 0, 0, 0),
+    (0.01043, 0, 0, 0, 2, 0), (0.00734, 1, 1, -1, 0, 0), (-0.00515, 1, 1, 1, 0, 0),
+    (0.00209, 2, 0, 2, 0, 0), (-0.00111, 0, 1, 0, -2, 0), (-0.00057, 0, 1, 0, 2, 0),
+    (0.00056, 1, 2, 1, 0, 0), (-0.00042, 0, 3, 0, 0, 0), (0.00042, 1, 0, 1, 2, 0),
+    (0.00038, 1, 0, 1, -2, 0), (-0.00024, 1, 2, -1, 0, 0), (-0.00017, 0, 0, 0, 0, 1),
+    (-0.00007, 0, 1, 2, 0, 0), (0.00004, 0, 2, 0, -2, 0), (0.00004, 0, 0, 3, 0, 0),
+    (0.00003, 0, 1, 1, -2, 0), (0.00003, 0, 2, 0, 2, 0), (-0.00003, 0, 1, 1, 2, 0),
+    (0.00003, 0, 1, -1, 2, 0), (-0.00002, 0, 1, -1, -2, 0), (-0.00002, 0, 3, 1, 0, 0),
+    (0.00002, 0, 4, 0, 0, 0),
+]
+
+# Additional planetary arguments A1..A14: (coefficient, constant, rate per lunation)
+_PLANETARY_TERMS = [
+    (0.000325, 299.77, 0.107408), (0.000165, 251.88, 0.016321), (0.000164, 251.83, 26.651886),
+    (0.000126, 349.42, 36.412478), (0.000110, 84.66, 18.206239), (0.000062, 141.74, 53.303771),
+    (0.000060, 207.14, 2.453732), (0.000056, 154.84, 7.306860), (0.000047, 34.52, 27.261239),
+    (0.000042, 207.19, 0.121824), (0.000040, 291.34, 1.844379), (0.000037, 161.72, 24.198154),
+    (0.000035, 239.56, 25.513099), (0.000023, 331.55, 3.592518),
+]
+
+
+def _to_utc_index(values):
+    """Coerce dates/strings/timestamps to a UTC DatetimeIndex (naive input is read as IST)"""
+    idx = pd.DatetimeIndex(pd.to_datetime(values, format='mixed'))
+    if idx.tz is None:
+        idx = idx.tz_localize(IST)
+    return idx.tz_convert('UTC')
+
+
+def _julian_day(utc_index):
+    """Julian day (UT) for a UTC DatetimeIndex"""
+    days = (utc_index.tz_localize(None) - pd.Timestamp('1970-01-01')) / pd.Timedelta(days=1)
+    return np.asarray(days, dtype=np.float64) + _UNIX_EPOCH_JD
+
+
+def _delta_t_seconds(year):
+    """TT - UT in seconds (Espenak & Meeus polynomials, coarse outside 1961-2050)"""
+    year = np.asarray(year, dtype=np.float64)
+    t = year - 2000.0
+    u = (year - 1820.0) / 100.0
+    return np.select(
+        [year < 1961, year < 1986, year < 2005, year <= 2050],
+        [
+            -20.0 + 32.0 * u ** 2,
+            45.45 + 1.067 * (year - 1975) - (year - 1975) ** 2 / 260.0 - (year - 1975) ** 3 / 718.0,
+            63.86 + 0.3345 * t - 0.060374 * t ** 2 + 0.0017275 * t ** 3
+            + 0.000651814 * t ** 4 + 0.00002373599 * t ** 5,
+            62.92 + 0.32217 * t + 0.005589 * t ** 2,
+        ],
+        default=-20.0 + 32.0 * u ** 2 - 0.5628 * (2150.0 - year),
+    )
+
+
+def _phase_jde(k, full):
+    """Corrected Julian Ephemeris Day of the new (k integer) or full (k + 0.5) moons"""
+    T = k / 1236.85
+    jde = (2451550.09766 + _SYNODIC_MONTH * k + 0.00015437 * T ** 2
+           - 0.000000150 * T ** 3 + 0.00000000073 * T ** 4)
+    E = 1.0 - 0.002516 * T - 0.0000074 * T ** 2
+    M = np.radians(2.5534 + 29.10535670 * k - 0.0000014 * T ** 2 - 0.00000011 * T ** 3)
+    Mp = np.radians(201.5643 + 385.81693528 * k + 0.0107582 * T ** 2
+                    + 0.00001238 * T ** 3 - 0.000000058 * T ** 4)
+    F = np.radians(160.7108 + 390.67050284 * k - 0.0016118 * T ** 2
+                   - 0.00000227 * T ** 3 + 0.000000011 * T ** 4)
+    Om = np.radians(124.7746 - 1.56375588 * k + 0.0020672 * T ** 2 + 0.00000215 * T ** 3)
+
+    for coef, e_pow, c_mp, c_m, c_f, c_om in (_FULL_MOON_TERMS if full else _NEW_MOON_TERMS):
+        jde = jde + coef * E ** e_pow * np.sin(c_mp * Mp + c_m * M + c_f * F + c_om * Om)
+
+    for coef, const, rate in _PLANETARY_TERMS:
+        arg = const + rate * k
+        if const == 299.77:
+            arg = arg - 0.009173 * T ** 2
+        jde = jde + coef * np.sin(np.radians(arg))
+    return jde
+
+
+def lunar_phases(start, end, phase='full'):
+    """Full-moon or new-moon instants between start and end, as an IST DatetimeIndex"""
+    if phase not in ('full', 'new'):
+        raise ValueError("phase must be 'full' or 'new'")
+    start_utc, end_utc = _to_utc_index([start, end])
+    jd_start, jd_end = _julian_day(pd.DatetimeIndex([start_utc, end_utc]))
+
+    # Lunation numbers that can fall inside the range, with one spare on each side
+    k_first = np.floor((jd_start - 2451550.09766) / _SYNODIC_MONTH) - 1
+    k_last = np.ceil((jd_end - 2451550.09766) / _SYNODIC_MONTH) + 1
+    k = np.arange(k_first, k_last + 1)
+    if phase == 'full':
+        k = k + 0.5
+
+    jde = _phase_jde(k, full=(phase == 'full'))
+    approx_year = 2000.0 + k / 12.3685
+    jd_ut = jde - _delta_t_seconds(approx_year) / 86400.0
+    jd_ut = jd_ut[(jd_ut >= jd_start) & (jd_ut <= jd_end)]
+
+    ns = np.round((jd_ut - _UNIX_EPOCH_JD) * 86400.0 * 1e9).astype('int64')
+    return pd.DatetimeIndex(ns.astype('datetime64[ns]')).tz_localize('UTC').tz_convert(IST)
+
+
+def lunar_calendar(start, end):
+    """All Purnima and Amavasya instants in a range, sorted, as a DataFrame"""
+    full = lunar_phases(start, end, 'full')
+    new = lunar_phases(start, end, 'new')
+    calendar = pd.DataFrame({
+        'Datetime': full.append(new),
+        'Event': ['Purnima'] * len(full) + ['Amavasya'] * len(new),
+    })
+    return calendar.sort_values('Datetime').reset_index(drop=True)
+
+
+def phase_frame(start, end, phase):
+    """Single-column frame shaped like poornima.csv / amavasya.csv after loading"""
+    return pd.DataFrame({'Datetime': lunar_phases(start, end, phase)})
+
+
+def solar_longitude(times):
+    """Apparent geocentric ecliptic longitude of the Sun in degrees [0, 360)"""
+    utc = _to_utc_index(times)
+    jd = _julian_day(utc)
+    jde = jd + _delta_t_seconds(utc.year + utc.dayofyear / 365.25) / 86400.0
+    T = (jde - 2451545.0) / 36525.0
+
+    L0 = 280.46646 + 36000.76983 * T + 0.0003032 * T ** 2
+    M = np.radians(357.52911 + 35999.05029 * T - 0.0001537 * T ** 2)
+    C = ((1.914602 - 0.004817 * T - 0.000014 * T ** 2) * np.sin(M)
+         + (0.019993 - 0.000101 * T) * np.sin(2 * M)
+         + 0.000289 * np.sin(3 * M))
+    omega = np.radians(125.04 - 1934.136 * T)
+    apparent = L0 + C - 0.00569 - 0.00478 * np.sin(omega)
+    return np.mod(apparent, 360.0)
+
+
+def sun_signs(times):
+    """Tropical sun sign for each instant, from the actual solar longitude"""
+    return ZODIAC_SIGNS[(solar_longitude(times) // 30).astype(int)]
+
+
+def validate_against_csv(path, phase, tolerance_days=1):
+    """Compare generated dates with a poornima.csv / amavasya.csv style file.
+
+    Dates are compared in IST over the range the file covers. Returns a dict
+    with counts of matched, missing and extra dates and the largest offset.
+    """
+    df = pd.read_csv(path)
+    raw = pd.to_datetime(df[df.columns[0]], errors='coerce').dropna()
+    if raw.empty:
+        return {'file_events': 0, 'generated_events': 0, 'matched': 0, 'exact': 0,
+                'missing': [], 'extra': [], 'max_offset_days': None}
+    if raw.dt.tz is None:
+        raw = raw.dt.tz_localize(IST)
+    file_dates = np.array(sorted(raw.dt.tz_convert(IST).dt.normalize().dt.tz_localize(None).unique()),
+                          dtype='datetime64[D]')
+
+    start = pd.Timestamp(file_dates[0]) - pd.Timedelta(days=tolerance_days)
+    end = pd.Timestamp(file_dates[-1]) + pd.Timedelta(days=tolerance_days + 1)
+    generated = lunar_phases(start, end, phase)
+    gen_dates = generated.normalize().tz_localize(None).values.astype('datetime64[D]')
+
+    # Nearest generated date for each file date (both sorted)
+    pos = np.clip(np.searchsorted(gen_dates, file_dates), 1, max(len(gen_dates) - 1, 1))
+    left = gen_dates[pos - 1]
+    right = gen_dates[np.minimum(pos, len(gen_dates) - 1)]
+    offsets = np.minimum(np.abs((file_dates - left).astype(int)),
+                         np.abs((right - file_dates).astype(int)))
+    matched = offsets <= tolerance_days
+
+    pos_back = np.clip(np.searchsorted(file_dates, gen_dates), 1, max(len(file_dates) - 1, 1))
+    back = np.minimum(np.abs((gen_dates - file_dates[pos_back - 1]).astype(int)),
+                      np.abs((file_dates[np.minimum(pos_back, len(file_dates) - 1)] - gen_dates).astype(int)))
+
+    return {
+        'file_events': len(file_dates),
+        'generated_events': len(gen_dates),
+        'matched': int(matched.sum()),
+        'exact': int((offsets == 0).sum()),
+        'missing': [str(d) for d in file_dates[~matched]],
+        'extra': [str(d) for d in gen_dates[back > tolerance_days]],
+        'max_offset_days': int(offsets.max()),
+    }
+
+
+def main():
+    """Time a multi-decade calendar build and check it against the local CSVs"""
+    t0 = time.perf_counter()
+    calendar = lunar_calendar('1950-01-01', '2050-12-31')
+    signs = sun_signs(calendar['Datetime'])
+    elapsed = (time.perf_counter() - t0) * 1000
+    print(f"Generated {len(calendar)} lunar events with sun signs for 1950-2050 in {elapsed:.1f} ms")
+
+    for path, phase in (('poornima.csv', 'full'), ('amavasya.csv', 'new')):
+        try:
+            report = validate_against_csv(path, phase)
+        except FileNotFoundError:
+            print(f"{path} not found, skipping validation")
+            continue
+        print(f"\n{path}: {report['matched']}/{report['file_events']} dates matched within 1 day "
+              f"({report['exact']} exact), max offset {report['max_offset_days']} days")
+        if report['missing']:
+            print(f"  Not matched: {', '.join(report['missing'][:10])}")
+        if report['extra']:
+            print(f"  Generated but absent from file: {', '.join(report['extra'][:10])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Vectorized Purnima/Amavasya event study.
+
+For every lunar event the entry is the close of the first trading day on or
+after the event date. Forward returns, maximum favourable excursion (MFE) and
+maximum adverse excursion (MAE) are then built for horizons 1..N trading days
+in one pass as events x horizons matrices, with no per-trade simulation.
+"""
+import numpy as np
+import pandas as pd
+
+# Same search window get_price_on_date uses for a missing trading day
+MAX_GAP_DAYS = 5
+
+
+def _find_column(df, name):
+    """Exact column name if present, else the first column containing it (case-insensitive)"""
+    if name in df.columns:
+        return name
+    for col in df.columns:
+        if name.lower() in col.lower():
+            return col
+    raise KeyError(f"No {name} column found in price data")
+
+
+def collect_events(purnima_df, amavasya_df):
+    """Combine the lunar calendars into one sorted (Date, Event) frame"""
+    events = pd.concat([
+        pd.DataFrame({'Date': purnima_df['Date'].values, 'Event': 'Purnima'}),
+        pd.DataFrame({'Date': amavasya_df['Date'].values, 'Event': 'Amavasya'}),
+    ], ignore_index=True)
+    return events.sort_values('Date', kind='stable').reset_index(drop=True)
+
+
+def build_event_matrix(nifty_df, events, horizons=20, direction='long'):
+    """Forward return / MFE / MAE matrices for each event and horizon 1..horizons.
+
+    direction='long' measures every event from a long position. 'strategy'
+    flips Amavasya events to the short side, matching implement_trading_strategy.
+    Returns (events_df, matrices) where matrices maps 'return_pct', 'return_pts',
+    'mfe_pts' and 'mae_pts' to events x horizons DataFrames (NaN past the data).
+    """
+    prices = nifty_df.sort_values('Date')
+    close = prices[_find_column(prices, 'Close')].to_numpy(dtype=np.float64)
+    high = prices[_find_column(prices, 'High')].to_numpy(dtype=np.float64)
+    low = prices[_find_column(prices, 'Low')].to_numpy(dtype=np.float64)
+    trade_dates = pd.to_datetime(prices['Date']).to_numpy(dtype='datetime64[D]')
+    n_days = len(close)
+
+    event_dates = pd.to_datetime(events['Date']).to_numpy(dtype='datetime64[D]')
+    entry_idx = np.searchsorted(trade_dates, event_dates, side='left')
+    in_range = entry_idx < n_days
+    gap = np.full(len(entry_idx), np.iinfo(np.int64).max)
+    gap[in_range] = (trade_dates[entry_idx[in_range]] - event_dates[in_range]).astype(np.int64)
+    keep = in_range & (gap <= MAX_GAP_DAYS)
+
+    events_df = events.loc[keep].reset_index(drop=True).copy()
+    entry_idx = entry_idx[keep]
+    events_df['Entry_Date'] = prices['Date'].to_numpy()[entry_idx]
+    events_df['Entry_Price'] = close[entry_idx]
+    if 'Sun_Sign' in prices.columns:
+        events_df['Sun_Sign'] = prices['Sun_Sign'].to_numpy()[entry_idx]
+
+    # events x horizons index grid; positions past the last bar are masked
+    steps = np.arange(1, horizons + 1)
+    idx = entry_idx[:, None] + steps[None, :]
+    valid = idx < n_days
+    idx = np.where(valid, idx, n_days - 1)
+
+    entry = close[entry_idx][:, None]
+    fwd_close = np.where(valid, close[idx], np.nan)
+    fwd_high = np.where(valid, high[idx], np.nan)
+    fwd_low = np.where(valid, low[idx], np.nan)
+
+    # Running extremes along the horizon axis (masked tail stays NaN)
+    run_high = np.fmax.accumulate(fwd_high, axis=1)
+    run_low = np.fmin.accumulate(fwd_low, axis=1)
+    run_high[~valid] = np.nan
+    run_low[~valid] = np.nan
+
+    side = np.ones(len(events_df))
+    if direction == 'strategy':
+        side[events_df['Event'].to_numpy() == 'Amavasya'] = -1.0
+    elif direction != 'long':
+        raise ValueError("direction must be 'long' or 'strategy'")
+    side = side[:, None]
+
+    return_pts = side * (fwd_close - entry)
+    favourable = np.where(side > 0, run_high - entry, entry - run_low)
+    adverse = np.where(side > 0, run_low - entry, entry - run_high)
+
+    columns = pd.Index(steps, name='Horizon')
+    matrices = {
+        'return_pts': pd.DataFrame(return_pts, columns=columns),
+        'return_pct': pd.DataFrame(return_pts / entry * 100, columns=columns),
+        'mfe_pts': pd.DataFrame(np.maximum(favourable, 0), columns=columns).where(valid),
+        'mae_pts': pd.DataFrame(np.minimum(adverse, 0), columns=columns).where(valid),
+    }
+    return events_df, matrices
+
+
+def summarize(events_df, matrices, by=('Event', 'Sun_Sign')):
+    """Distribution of outcomes per group and horizon, in long format"""
+    by = [col for col in by if col in events_df.columns]
+    n_events, n_horizons = matrices['return_pct'].shape
+    long_df = pd.DataFrame({
+        'Horizon': np.tile(matrices['return_pct'].columns.to_numpy(), n_events),
+        **{name: matrix.to_numpy().ravel() for name, matrix in matrices.items()},
+    })
+    for col in by:
+        long_df[col] = np.repeat(events_df[col].to_numpy(), n_horizons)
+    long_df = long_df.dropna(subset=['return_pct'])
+    long_df['win'] = long_df['return_pct'] > 0
+
+    grouped = long_df.groupby(by + ['Horizon'])
+    summary = grouped.agg(
+        Events=('return_pct', 'size'),
+        Mean_Return_Pct=('return_pct', 'mean'),
+        Median_Return_Pct=('return_pct', 'median'),
+        Std_Return_Pct=('return_pct', 'std'),
+        Mean_Return_Pts=('return_pts', 'mean'),
+        Win_Rate=('win', 'mean'),
+        Mean_MFE_Pts=('mfe_pts', 'mean'),
+        Mean_MAE_Pts=('mae_pts', 'mean'),
+    )
+    summary['Win_Rate'] = summary['Win_Rate'] * 100
+    return summary.round(3)
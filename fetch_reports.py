@@ -0,0 +1,202 @@
+"""Download NSDL fortnightly sector-wise FPI reports ahead of the cleaning step.
+
+Reports are fetched concurrently with asyncio over one pooled aiohttp session.
+Every request is conditional (If-None-Match / If-Modified-Since from the last
+download), so reports that have not changed come back as 304 with no body.
+Transient failures are retried with exponential backoff. State is saved after
+every download, so an interrupted backfill resumes with conditional requests,
+and dates that were missing under every spelling are not probed again for
+MISSING_RETRY_DAYS. Reports younger than PUBLISH_GRACE_DAYS may simply not be
+published yet, so those are always retried. Raw files are saved
+as raw_reports/FIIInvestSector_<YYYY-MM-DD>.html so later steps never have to
+guess the date from NSDL's inconsistent month spellings.
+
+Point --base-url at a local HTTP server serving fixture files to test offline.
+"""
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+import calendar
+from datetime import date
+import aiohttp
+
+BASE_URL = "https://www.fpi.nsdl.co.in/web/StaticReports/Fortnightly_Sector_wise_FII_Investment_Data"
+RAW_DIR = "raw_reports"
+STATE_FILE = "_fetch_state.json"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MISSING_RETRY_DAYS = 7
+PUBLISH_GRACE_DAYS = 10
+
+# NSDL has published the same month under several spellings over the years
+MONTH_VARIANTS = {
+    1: ["Jan", "January"], 2: ["Feb", "February"], 3: ["Mar", "March"],
+    4: ["Apr", "April"], 5: ["May"], 6: ["Jun", "June", "JUNE"],
+    7: ["Jul", "July", "JULY"], 8: ["Aug", "August"], 9: ["Sep", "September", "Sept"],
+    10: ["Oct", "October"], 11: ["Nov", "November"], 12: ["Dec", "December"],
+}
+
+
+def fortnight_dates(start, end):
+    """Report dates (15th and last day of each month) between start and end"""
+    dates = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        last_day = calendar.monthrange(year, month)[1]
+        for day in (15, last_day):
+            d = date(year, month, day)
+            if start <= d <= end:
+                dates.append(d)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return dates
+
+
+def candidate_names(report_date):
+    """Remote file names to try for a report date, most common spelling first"""
+    return [f"FIIInvestSector_{m}{report_date.day:02d}{report_date.year}.html"
+            for m in MONTH_VARIANTS[report_date.month]]
+
+
+def local_name(report_date):
+    return f"FIIInvestSector_{report_date.isoformat()}.html"
+
+
+def load_state(out_dir):
+    path = os.path.join(out_dir, STATE_FILE)
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(out_dir, state):
+    path = os.path.join(out_dir, STATE_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(state, fh, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+async def _get(session, url, headers, retries, backoff):
+    """GET with retries on connection errors and retryable statuses; returns (status, body, headers)"""
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url, headers=headers) as resp:
+                if resp.status in RETRY_STATUSES and attempt < retries:
+                    raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status)
+                body = await resp.read() if resp.status == 200 else b""
+                return resp.status, body, resp.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+            await asyncio.sleep(backoff * (2 ** attempt) * (1 + random.random()))
+
+
+def _recently_missing(report_date, entry, now):
+    """True if an old report was missing under every spelling within MISSING_RETRY_DAYS"""
+    if (date.fromtimestamp(now) - report_date).days <= PUBLISH_GRACE_DAYS:
+        return False
+    checked = (entry or {}).get("missing_checked")
+    return checked is not None and now - checked < MISSING_RETRY_DAYS * 86400
+
+
+async def fetch_one(session, semaphore, report_date, state, base_url, out_dir, retries, backoff):
+    """Fetch one report, trying each spelling; returns a result dict"""
+    key = report_date.isoformat()
+    path = os.path.join(out_dir, local_name(report_date))
+    entry = state.get(key)
+    if not os.path.exists(path) and _recently_missing(report_date, entry, time.time()):
+        return {"date": key, "status": "skipped_missing"}
+    known = entry if os.path.exists(path) and entry and "remote_name" in entry else None
+
+    # Try the name that worked last time first
+    names = candidate_names(report_date)
+    if known and known.get("remote_name") in names:
+        names.remove(known["remote_name"])
+        names.insert(0, known["remote_name"])
+
+    async with semaphore:
+        for name in names:
+            url = f"{base_url}/{name}"
+            headers = {}
+            if known and known.get("remote_name") == name:
+                if known.get("etag"):
+                    headers["If-None-Match"] = known["etag"]
+                if known.get("last_modified"):
+                    headers["If-Modified-Since"] = known["last_modified"]
+            try:
+                status, body, resp_headers = await _get(session, url, headers, retries, backoff)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                return {"date": key, "status": "error", "detail": str(e) or type(e).__name__}
+
+            if status == 304:
+                return {"date": key, "status": "not_modified", "path": path}
+            if status == 200:
+                tmp_path = f"{path}.part"
+                with open(tmp_path, "wb") as fh:
+                    fh.write(body)
+                os.replace(tmp_path, path)
+                state[key] = {
+                    "remote_name": name,
+                    "etag": resp_headers.get("ETag"),
+                    "last_modified": resp_headers.get("Last-Modified"),
+                }
+                save_state(out_dir, state)
+                return {"date": key, "status": "downloaded", "path": path, "bytes": len(body)}
+            if status not in (404, 410):
+                return {"date": key, "status": "error", "detail": f"HTTP {status} for {name}"}
+
+    state[key] = {"missing_checked": time.time()}
+    save_state(out_dir, state)
+    return {"date": key, "status": "missing"}
+
+
+async def fetch_all(report_dates, base_url=BASE_URL, out_dir=RAW_DIR, concurrency=8,
+                    retries=3, backoff=0.5, timeout=30):
+    """Fetch reports for all dates with at most `concurrency` requests in flight"""
+    os.makedirs(out_dir, exist_ok=True)
+    state = load_state(out_dir)
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        results = await asyncio.gather(*[
+            fetch_one(session, semaphore, d, state, base_url.rstrip("/"), out_dir, retries, backoff)
+            for d in report_dates
+        ])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch NSDL fortnightly sector-wise FPI reports")
+    parser.add_argument("--start", default="2020-01-01", help="first report date (YYYY-MM-DD)")
+    parser.add_argument("--end", default=date.today().isoformat(), help="last report date (YYYY-MM-DD)")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--out-dir", default=RAW_DIR)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--retries", type=int, default=3)
+    args = parser.parse_args()
+
+    report_dates = fortnight_dates(date.fromisoformat(args.start), date.fromisoformat(args.end))
+    print(f"Fetching {len(report_dates)} fortnightly reports with up to {args.concurrency} parallel requests...")
+    t0 = time.perf_counter()
+    results = asyncio.run(fetch_all(report_dates, args.base_url, args.out_dir,
+                                    args.concurrency, args.retries))
+    elapsed = time.perf_counter() - t0
+
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+        if result["status"] in ("error", "missing"):
+            print(f"⚠️ {result['date']}: {result['status']} {result.get('detail', '')}".rstrip())
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    print(f"✅ Done in {elapsed:.1f}s: {summary}")
+
+
+if __name__ == "__main__":
+    main()
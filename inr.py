@@ -1,20 +1,28 @@
 import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
+import perf
+
+rerun_stage = perf.stage("inr.streamlit_rerun").start()
 
 st.set_page_config(page_title="FPI vs INR Return Dashboard", layout="wide")
 st.title("💸 Fortnightly Net FPI Change vs INR Return (%)")
 
 
-fpi_df = pd.read_csv("Fortnightly_Total_FPI.csv")
-inr_df = pd.read_csv("Formatted_Fortnightly_Returns_USD_INR.csv")
+with perf.stage("inr.load_csv") as load_stage:
+    fpi_df = pd.read_csv("Fortnightly_Total_FPI.csv")
+    inr_df = pd.read_csv("Formatted_Fortnightly_Returns_USD_INR.csv")
+    load_stage.set_rows(len(fpi_df) + len(inr_df))
 
 
-fpi_df["Date"] = pd.to_datetime(fpi_df["Date"], format="%d-%b-%y")
-inr_df["Date"] = pd.to_datetime(inr_df["Date"], format="%d-%b-%y")
+with perf.stage("inr.parse_dates", rows=len(fpi_df) + len(inr_df)):
+    fpi_df["Date"] = pd.to_datetime(fpi_df["Date"], format="%d-%b-%y")
+    inr_df["Date"] = pd.to_datetime(inr_df["Date"], format="%d-%b-%y")
 
 
-merged_df = pd.merge(fpi_df, inr_df, on="Date", how="inner")
+with perf.stage("inr.merge") as merge_stage:
+    merged_df = pd.merge(fpi_df, inr_df, on="Date", how="inner")
+    merge_stage.set_rows(len(merged_df))
 
 
 merged_df["Year"] = merged_df["Date"].dt.year
@@ -70,3 +78,5 @@ fig.update_layout(
 
 st.plotly_chart(fig, use_container_width=True)
 
+rerun_stage.stop(rows=len(yearly_data))
+
@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
+import perf
+
+rerun_stage = perf.stage("jpy.streamlit_rerun").start()
 
 st.set_page_config(layout="wide")
 st.title("📈 FPI & Currency Dashboard")
@@ -8,9 +11,11 @@ st.title("📈 FPI & Currency Dashboard")
 
 @st.cache_data
 def load_data():
-    fpi = pd.read_csv("Fortnightly_Total_FPI.csv")
-    jpy = pd.read_csv("Fortnightly_Returns_USD_JPY.csv")
-    cny = pd.read_csv("Fortnightly_Returns_USD_CNY.csv")
+    with perf.stage("jpy.load_csv") as load_stage:
+        fpi = pd.read_csv("Fortnightly_Total_FPI.csv")
+        jpy = pd.read_csv("Fortnightly_Returns_USD_JPY.csv")
+        cny = pd.read_csv("Fortnightly_Returns_USD_CNY.csv")
+        load_stage.set_rows(len(fpi) + len(jpy) + len(cny))
 
     
     for df in [fpi, jpy, cny]:
@@ -21,9 +26,10 @@ def load_data():
         df.rename(columns={"Price": "Close"}, inplace=True)
 
     
-    fpi["Date"] = pd.to_datetime(fpi["Date"])
-    jpy["Date"] = pd.to_datetime(jpy["Date"])
-    cny["Date"] = pd.to_datetime(cny["Date"])
+    with perf.stage("jpy.parse_dates", rows=len(fpi) + len(jpy) + len(cny)):
+        fpi["Date"] = pd.to_datetime(fpi["Date"])
+        jpy["Date"] = pd.to_datetime(jpy["Date"])
+        cny["Date"] = pd.to_datetime(cny["Date"])
 
     return fpi, jpy, cny
 
@@ -79,3 +85,5 @@ fig.update_layout(
 
 
 st.plotly_chart(fig, use_container_width=True)
+
+rerun_stage.stop(rows=len(fpi_filtered) + len(currency_filtered))
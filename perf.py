@@ -0,0 +1,296 @@
+"""Lightweight stage timing for the loaders, dashboards and the backtest.
+
+Disabled by default. Set FPI_PERF=1 (or call perf.enable()) to record wall
+time, rows processed and peak memory for each named stage. Records are
+appended to FPI_PERF_JSONL (default perf_stages.jsonl) and per-stage totals are
+written in Prometheus text format to FPI_PERF_PROM (default perf_stages.prom).
+
+Peak memory is the process peak RSS, which costs nothing to read. Set
+FPI_PERF_MEM=1 (or enable(trace_memory=True)) for per-stage tracemalloc peaks
+instead; tracing slows Python-heavy code several times over, so wall times
+recorded with it on are not representative.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import threading
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+JSONL_PATH = os.environ.get("FPI_PERF_JSONL", "perf_stages.jsonl")
+PROM_PATH = os.environ.get("FPI_PERF_PROM", "perf_stages.prom")
+
+_enabled = False
+_trace_memory = False
+_open_stages = 0  # stages open across all threads, guarded by _lock
+_local = threading.local()  # per-thread stack of open stages (Dash serves callbacks on threads)
+_lock = threading.Lock()
+_totals = {}  # stage name -> [calls, seconds, rows, peak_bytes]
+
+
+class _NullStage:
+    """Stand-in returned while instrumentation is off; every method is a no-op."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def start(self):
+        return self
+
+    def stop(self, rows=None):
+        pass
+
+    def set_rows(self, rows):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Stage:
+    """One timed stage. Use as a context manager or with start()/stop()."""
+    __slots__ = ("name", "rows", "_t0", "_mem0", "_peak_seen")
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self._t0 = None
+        self._mem0 = 0
+        self._peak_seen = 0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def set_rows(self, rows):
+        self.rows = rows
+
+    def start(self):
+        # A same-named stage still open means its run was cut short (e.g. a
+        # Streamlit rerun interrupted mid-script); drop it so it can't leak.
+        stack = _stack()
+        for i, open_stage in enumerate(stack):
+            if open_stage.name == self.name:
+                _close(len(stack) - i)
+                del stack[i:]
+                break
+        current, peak = _memory()
+        if stack:
+            # Keep the parent's peak before resetting the counter for this stage
+            parent = stack[-1]
+            parent._peak_seen = max(parent._peak_seen, peak)
+        global _open_stages
+        with _lock:
+            # The traced peak is process-wide: only reset it when every open
+            # stage is on this thread, or a concurrent Dash callback on another
+            # thread would lose its peak. Overlapping stages then share a peak.
+            if _trace_memory and _open_stages == len(stack):
+                tracemalloc.reset_peak()
+                peak = current
+            _open_stages += 1
+        self._mem0 = current
+        self._peak_seen = peak if _trace_memory else current
+        stack.append(self)
+        self._t0 = time.perf_counter()
+        return self
+
+    def stop(self, rows=None):
+        elapsed = time.perf_counter() - self._t0
+        if rows is not None:
+            self.rows = rows
+        peak = max(self._peak_seen, _memory()[1])
+        stack = _stack()
+        for i, open_stage in enumerate(stack):
+            if open_stage is self:
+                _close(len(stack) - i)
+                del stack[i:]
+                break
+        if stack:
+            stack[-1]._peak_seen = max(stack[-1]._peak_seen, peak)
+        _record(self, elapsed, peak, depth=len(stack))
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _close(count):
+    global _open_stages
+    with _lock:
+        _open_stages = max(0, _open_stages - count)
+
+
+def _peak_rss():
+    """Highest resident set size of this process so far, in bytes"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _memory():
+    """(current, peak) bytes: traced memory when tracing, else peak RSS for both"""
+    if _trace_memory:
+        return tracemalloc.get_traced_memory()
+    peak = _peak_rss()
+    return peak, peak
+
+
+def enable(trace_memory=None):
+    """Turn instrumentation on for this process.
+
+    trace_memory defaults to the FPI_PERF_MEM environment variable.
+    """
+    global _enabled, _trace_memory
+    if trace_memory is None:
+        trace_memory = _truthy(os.environ.get("FPI_PERF_MEM"))
+    _trace_memory = trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+
+def disable():
+    """Turn instrumentation off and flush the Prometheus totals."""
+    global _enabled
+    if _enabled:
+        write_prometheus()
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def stage(name, rows=None):
+    """Return a timed stage, or a shared no-op object when disabled."""
+    if not _enabled:
+        return _NULL_STAGE
+    return Stage(name, rows)
+
+
+def timed(name=None, rows=None):
+    """Decorator timing every call of a function as a stage.
+
+    rows, if given, is called with the return value to get the row count.
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            st = Stage(stage_name).start()
+            try:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    st.rows = _safe_rows(rows, result)
+                return result
+            finally:
+                st.stop()
+        return wrapper
+    return decorator
+
+
+def _safe_rows(rows, result):
+    try:
+        return int(rows(result))
+    except Exception:
+        return 0
+
+
+def _record(st, elapsed, peak, depth):
+    with _lock:
+        totals = _totals.setdefault(st.name, [0, 0.0, 0, 0])
+        totals[0] += 1
+        totals[1] += elapsed
+        totals[2] += int(st.rows or 0)
+        totals[3] = max(totals[3], peak)
+
+    record = {
+        "ts": time.time(),
+        "stage": st.name,
+        "seconds": round(elapsed, 6),
+        "rows": st.rows,
+        "peak_mem_bytes": peak,
+        "mem_delta_bytes": peak - st._mem0,
+        "depth": depth,
+        "pid": os.getpid(),
+    }
+    with _lock:
+        with open(JSONL_PATH, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record) + "\n")
+
+    # Long-lived processes (Dash, Streamlit) never reach atexit, so refresh
+    # the Prometheus file whenever an outermost stage finishes.
+    if depth == 0:
+        write_prometheus()
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_prometheus(path=None):
+    """Write per-stage totals in Prometheus text exposition format."""
+    path = path or PROM_PATH
+    metrics = [
+        ("fpi_stage_calls_total", "counter", "Number of times the stage ran.", 0),
+        ("fpi_stage_seconds_total", "counter", "Wall time spent in the stage.", 1),
+        ("fpi_stage_rows_total", "counter", "Rows processed by the stage.", 2),
+        ("fpi_stage_peak_memory_bytes", "gauge", "Highest traced memory (or process peak RSS) seen during the stage.", 3),
+    ]
+    with _lock:
+        snapshot = sorted((name, list(t)) for name, t in _totals.items())
+    lines = []
+    for metric, kind, help_text, idx in metrics:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for stage_name, totals in snapshot:
+            lines.append(f'{metric}{{stage="{_escape(stage_name)}"}} {totals[idx]}')
+
+    # Write to a temp file and swap it in so a scraper never reads half a file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+def summary():
+    """Return per-stage totals as a dict, handy for notebooks."""
+    return {
+        name: {"calls": t[0], "seconds": t[1], "rows": t[2], "peak_mem_bytes": t[3]}
+        for name, t in _totals.items()
+    }
+
+
+@atexit.register
+def _flush_on_exit():
+    if _enabled and _totals:
+        write_prometheus()
+
+
+def _truthy(value):
+    return (value or "").lower() in ("1", "true", "yes", "on")
+
+
+if _truthy(os.environ.get("FPI_PERF")):
+    enable()
@@ -0,0 +1,110 @@
+"""Content-addressed on-disk cache for backtest results.
+
+Entries are keyed by a hash of the input data files, the strategy parameters
+and the source of the code that produced them, so any change to one of those
+misses the cache. Tables are stored as pickled DataFrames (binary, keeps dtypes).
+Total size is bounded; the least recently used entries are evicted first.
+"""
+import os
+import json
+import hashlib
+import pandas as pd
+
+CACHE_DIR = os.environ.get("FPI_CACHE_DIR", ".backtest_cache")
+CACHE_MAX_MB = float(os.environ.get("FPI_CACHE_MAX_MB", "256"))
+
+_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in chunks"""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def make_key(input_paths, params, code_paths):
+    """Build a cache key from input files, parameters and code files.
+
+    Returns None if any input file is missing, since there is nothing to key on.
+    """
+    h = hashlib.sha256()
+    for label, paths in (("input", input_paths), ("code", code_paths)):
+        for path in paths:
+            if not os.path.exists(path):
+                return None
+            h.update(f"{label}:{os.path.basename(path)}:{file_digest(path)}\n".encode())
+    h.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Directory of <key>.pkl files with LRU eviction by access time."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_mb=CACHE_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        """Return the cached dict of tables for key, or None on a miss"""
+        if key is None:
+            return None
+        path = self._path(key)
+        try:
+            tables = pd.read_pickle(path)
+        except (FileNotFoundError, EOFError, ValueError, OSError):
+            return None
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path)
+        return tables
+
+    def put(self, key, tables):
+        """Store a dict of name -> DataFrame under key, then enforce the size bound"""
+        if key is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        pd.to_pickle(tables, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name[:-4], path))
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, key, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove every cached entry"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.cache_dir, name))
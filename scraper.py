@@ -1,5 +1,7 @@
 import pandas as pd
 import glob
+import re
+import perf
 
 # Find all cleaned CSV files
 csv_files = sorted(glob.glob("*_cleaned.csv"))
@@ -15,19 +17,30 @@ month_corrections = {
     "JUNE": "Jun", "JULY": "Jul"  # Handling uppercase names like "JUNE15"
 }
 
+# clean_reports.py writes ISO-dated files (2020-04-15_cleaned.csv)
+iso_name = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+def parse_legacy_date(date_str):
+    """Parse hand-made names like April152020 or JUNE152020"""
+    # Fix month abbreviation issues
+    for full_month, short_month in month_corrections.items():
+        if full_month in date_str:
+            date_str = date_str.replace(full_month, short_month)
+
+    # Convert to standard date format
+    return pd.to_datetime(date_str, format="%b%d%Y", errors='coerce')
+
 # Loop through each cleaned CSV file
 for file in csv_files:
     try:
-        # Extract Date from filename (e.g., April152020_cleaned.csv → 15-Apr-2020)
+        # Extract Date from filename (2020-04-15_cleaned.csv, or legacy April152020_cleaned.csv)
         date_str = file.replace("_cleaned.csv", "")
 
-        # Fix month abbreviation issues
-        for full_month, short_month in month_corrections.items():
-            if full_month in date_str:
-                date_str = date_str.replace(full_month, short_month)
-
-        # Convert to standard date format
-        formatted_date = pd.to_datetime(date_str, format="%b%d%Y", errors='coerce')
+        with perf.stage("scraper.parse_dates", rows=1):
+            if iso_name.match(date_str):
+                formatted_date = pd.Timestamp(date_str)
+            else:
+                formatted_date = parse_legacy_date(date_str)
 
         # Skip if the date couldn't be parsed
         if pd.isna(formatted_date):
@@ -38,23 +51,25 @@ for file in csv_files:
         if formatted_date.year < 2020 or formatted_date.year > 2025:
             continue  # Skip data outside range
 
-        # Format date as 15-Jan-20
-        formatted_date_str = formatted_date.strftime("%d-%b-%y")
-
         # Read the CSV file
-        df = pd.read_csv(file)
+        with perf.stage("scraper.load_csv") as load_stage:
+            df = pd.read_csv(file)
+            load_stage.set_rows(len(df))
 
-        # Ensure at least 3 columns exist
-        if df.shape[1] < 3:
+        # Extract relevant columns: Sector & AUC for that date
+        if {"Sector", "AUC as on Date"}.issubset(df.columns):
+            # Named columns from clean_reports.py
+            df_final = df[["Sector", "AUC as on Date"]].copy()
+        elif df.shape[1] < 3:
+            # Ensure at least 3 columns exist
             print(f"⚠️ Skipping {file} (Not enough columns)")
             continue
+        else:
+            df_final = df.iloc[:, [0, 2]].copy()
+            df_final.columns = ["Sector", "AUC as on Date"]
 
-        # Extract relevant columns: Sector & AUC for that date
-        df_final = df.iloc[:, [0, 2]].copy()
-
-        # Rename columns
-        df_final.columns = ["Sector", "AUC as on Date"]
-        df_final.insert(0, "Date", formatted_date_str)
+        # Keep the parsed date; it is formatted once after sorting
+        df_final.insert(0, "Date", formatted_date)
 
         # Store the formatted data
         data_list.append(df_final)
@@ -64,11 +79,12 @@ for file in csv_files:
 
 # Combine all data into one DataFrame
 if data_list:
-    final_df = pd.concat(data_list, ignore_index=True)
+    with perf.stage("scraper.merge") as merge_stage:
+        final_df = pd.concat(data_list, ignore_index=True)
+        merge_stage.set_rows(len(final_df))
 
-    # Convert Date column to datetime format and sort
-    final_df["Date"] = pd.to_datetime(final_df["Date"], format="%d-%b-%y")
-    final_df = final_df.sort_values(by="Date")
+    # Sort on the parsed dates (stable, so sector order within a date is kept)
+    final_df = final_df.sort_values(by="Date", kind="stable")
 
     # Convert Date column back to 15-Jan-20 format
     final_df["Date"] = final_df["Date"].dt.strftime("%d-%b-%y")
@@ -1,10 +1,29 @@
+import os
+import argparse
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import warnings
 import pytz
+import perf
+import ephemeris
+from result_cache import ResultCache, make_key
+from trade_sink import TradebookSink
+import event_study
 warnings.filterwarnings('ignore')
 
+# Input files and default strategy settings; both feed the result cache key.
+# Stop loss settings are in index points: the stop starts initial_sl away from
+# entry and, once profit reaches trail_trigger, moves trail_step for every
+# trail_frequency points of profit.
+INPUT_FILES = ['NIFTY 50.csv', 'poornima.csv', 'amavasya.csv']
+STRATEGY_PARAMS = {
+    'initial_sl': 50,
+    'trail_trigger': 25,
+    'trail_step': 75,
+    'trail_frequency': 25,
+}
+
 def get_zodiac_sign(date):
     """Get zodiac sign for a given date (Sun's position)"""
     month = date.month
@@ -35,6 +54,14 @@ def get_zodiac_sign(date):
     else:  # Pisces
         return 'Pisces'
 
+def read_csv_timed(path):
+    """read_csv inside a load_csv stage; a missing file raises before the stage opens"""
+    with open(path, 'rb') as fh:
+        with perf.stage("sun_moon4.load_csv") as load_stage:
+            df = pd.read_csv(fh)
+            load_stage.set_rows(len(df))
+    return df
+
 def load_and_clean_data():
     """Load and clean all required datasets with Mumbai timezone handling"""
     print("Loading data files...")
@@ -44,7 +71,7 @@ def load_and_clean_data():
     
     # Load Nifty 50 data
     try:
-        nifty_df = pd.read_csv('NIFTY 50.csv')
+        nifty_df = read_csv_timed('NIFTY 50.csv')
         print(f"Loaded Nifty 50 data: {len(nifty_df)} rows")
     except FileNotFoundError:
         print("Error: NIFTY 50.csv not found")
@@ -52,19 +79,21 @@ def load_and_clean_data():
     
     # Load Purnima dates
     try:
-        purnima_df = pd.read_csv('poornima.csv')
+        purnima_df = read_csv_timed('poornima.csv')
         print(f"Loaded Purnima data: {len(purnima_df)} rows")
     except FileNotFoundError:
-        print("Error: poornima.csv not found")
-        return None, None, None
+        # Generated from the built-in ephemeris once the Nifty date range is known
+        print("poornima.csv not found, Purnima dates will be computed with the built-in ephemeris")
+        purnima_df = None
     
     # Load Amavasya dates
     try:
-        amavasya_df = pd.read_csv('amavasya.csv')
+        amavasya_df = read_csv_timed('amavasya.csv')
         print(f"Loaded Amavasya data: {len(amavasya_df)} rows")
     except FileNotFoundError:
-        print("Error: amavasya.csv not found")
-        return None, None, None
+        # Generated from the built-in ephemeris once the Nifty date range is known
+        print("amavasya.csv not found, Amavasya dates will be computed with the built-in ephemeris")
+        amavasya_df = None
     
     # Clean Nifty data
     date_col = None
@@ -78,21 +107,45 @@ def load_and_clean_data():
         print(f"Using first column as date: {date_col}")
     
     # Convert dates and handle timezone for Mumbai
-    nifty_df[date_col] = pd.to_datetime(nifty_df[date_col], errors='coerce')
-    
-    # If timezone aware, convert to Mumbai timezone, otherwise assume Mumbai time
-    if nifty_df[date_col].dt.tz is not None:
-        nifty_df[date_col] = nifty_df[date_col].dt.tz_convert(mumbai_tz)
-    else:
-        nifty_df[date_col] = nifty_df[date_col].dt.tz_localize(mumbai_tz)
-    
-    # Convert to Mumbai date
-    nifty_df['Date'] = nifty_df[date_col].dt.tz_convert(mumbai_tz).dt.date
-    nifty_df = nifty_df.dropna(subset=[date_col])
-    
-    # Add zodiac information to Nifty data (Sun sign only)
-    nifty_df['Sun_Sign'] = nifty_df['Date'].apply(get_zodiac_sign)
+    with perf.stage("sun_moon4.parse_dates") as date_stage:
+        nifty_df[date_col] = pd.to_datetime(nifty_df[date_col], errors='coerce')
+        
+        # If timezone aware, convert to Mumbai timezone, otherwise assume Mumbai time
+        if nifty_df[date_col].dt.tz is not None:
+            nifty_df[date_col] = nifty_df[date_col].dt.tz_convert(mumbai_tz)
+        else:
+            nifty_df[date_col] = nifty_df[date_col].dt.tz_localize(mumbai_tz)
+        
+        # Convert to Mumbai date
+        nifty_df['Date'] = nifty_df[date_col].dt.tz_convert(mumbai_tz).dt.date
+        nifty_df = nifty_df.dropna(subset=[date_col])
+        
+        # Add zodiac information to Nifty data (Sun sign only)
+        nifty_df['Sun_Sign'] = nifty_df['Date'].apply(get_zodiac_sign)
+        date_stage.set_rows(len(nifty_df))
+    
+    # Fill in any missing lunar calendar, padded so the first/last events are covered
+    if purnima_df is None or amavasya_df is None:
+        calendar_start = nifty_df[date_col].min() - timedelta(days=31)
+        calendar_end = nifty_df[date_col].max() + timedelta(days=31)
+        with perf.stage("sun_moon4.generate_calendar") as calendar_stage:
+            if purnima_df is None:
+                purnima_df = ephemeris.phase_frame(calendar_start, calendar_end, 'full')
+                print(f"Generated Purnima data: {len(purnima_df)} rows")
+            if amavasya_df is None:
+                amavasya_df = ephemeris.phase_frame(calendar_start, calendar_end, 'new')
+                print(f"Generated Amavasya data: {len(amavasya_df)} rows")
+            calendar_stage.set_rows(len(purnima_df) + len(amavasya_df))
+    
+    with perf.stage("sun_moon4.parse_lunar_dates") as lunar_stage:
+        purnima_df, amavasya_df = clean_lunar_dates(purnima_df, amavasya_df, mumbai_tz)
+        lunar_stage.set_rows(len(purnima_df) + len(amavasya_df))
     
+    print("Data cleaning completed successfully!")
+    return nifty_df, purnima_df, amavasya_df
+
+def clean_lunar_dates(purnima_df, amavasya_df, mumbai_tz):
+    """Parse the lunar calendars to Mumbai dates and tag each with its sun sign"""
     # Clean astrology data - convert to Mumbai timezone
     purnima_col = purnima_df.columns[0]
     amavasya_col = amavasya_df.columns[0]
@@ -118,9 +171,7 @@ def load_and_clean_data():
     # Remove NaN dates
     purnima_df = purnima_df.dropna(subset=[purnima_col])
     amavasya_df = amavasya_df.dropna(subset=[amavasya_col])
-    
-    print("Data cleaning completed successfully!")
-    return nifty_df, purnima_df, amavasya_df
+    return purnima_df, amavasya_df
 
 def get_price_on_date(nifty_df, target_date, price_col='Close'):
     """Get price on a specific date or nearest trading day"""
@@ -145,8 +196,14 @@ def get_price_on_date(nifty_df, target_date, price_col='Close'):
     
     return None, None, None
 
-def check_stop_loss(nifty_df, entry_date, entry_price, position, initial_stop_loss):
+@perf.timed("check_stop_loss")
+def check_stop_loss(nifty_df, entry_date, entry_price, position, initial_stop_loss, params=None):
     """Check if stop loss was hit with trailing stop loss logic using intraday high/low"""
+    params = params or STRATEGY_PARAMS
+    trail_trigger = params['trail_trigger']
+    trail_step = params['trail_step']
+    trail_frequency = params['trail_frequency']
+    
     # Get all trading days after entry date
     entry_data = nifty_df[nifty_df['Date'] > entry_date].copy()
     if entry_data.empty:
@@ -193,10 +250,10 @@ def check_stop_loss(nifty_df, entry_date, entry_price, position, initial_stop_lo
             if current_profit > max_profit_achieved:
                 max_profit_achieved = current_profit
                 
-                # Trail stop loss: 25 trigger, 75 step, 25 frequency
-                if max_profit_achieved >= 25:  # trail_trigger
-                    profit_segments = int(max_profit_achieved / 25)  # trail_frequency
-                    new_sl = entry_price + (profit_segments * 75) - 75  # trail_step
+                # Trail stop loss by trail_step for every trail_frequency points
+                if max_profit_achieved >= trail_trigger:
+                    profit_segments = int(max_profit_achieved / trail_frequency)
+                    new_sl = entry_price + (profit_segments * trail_step) - trail_step
                     current_sl = max(current_sl, new_sl)
             
             # Check if intraday low hits stop loss
@@ -211,10 +268,10 @@ def check_stop_loss(nifty_df, entry_date, entry_price, position, initial_stop_lo
             if current_profit > max_profit_achieved:
                 max_profit_achieved = current_profit
                 
-                # Trail stop loss: 25 trigger, 75 step, 25 frequency
-                if max_profit_achieved >= 25:  # trail_trigger
-                    profit_segments = int(max_profit_achieved / 25)  # trail_frequency
-                    new_sl = entry_price - (profit_segments * 75) + 75  # trail_step
+                # Trail stop loss by trail_step for every trail_frequency points
+                if max_profit_achieved >= trail_trigger:
+                    profit_segments = int(max_profit_achieved / trail_frequency)
+                    new_sl = entry_price - (profit_segments * trail_step) + trail_step
                     current_sl = min(current_sl, new_sl)
             
             # Check if intraday high hits stop loss
@@ -223,11 +280,20 @@ def check_stop_loss(nifty_df, entry_date, entry_price, position, initial_stop_lo
     
     return None, None, 'No_SL_Hit'
 
-def implement_trading_strategy(nifty_df, purnima_df, amavasya_df):
-    """Implement the astrology-based trading strategy with sun sign tracking"""
+@perf.timed("implement_trading_strategy", rows=len)
+def implement_trading_strategy(nifty_df, purnima_df, amavasya_df, sink=None, params=None):
+    """Implement the astrology-based trading strategy with sun sign tracking
+
+    If a TradebookSink is given, trades are streamed to it instead of being
+    collected, and the returned list stays empty. params overrides
+    STRATEGY_PARAMS (e.g. for parameter sweeps).
+    """
+    params = params or STRATEGY_PARAMS
+    initial_sl = params['initial_sl']
     print(f"\nImplementing Astrology Trading Strategy")
     print("Strategy: Long on Purnima → Exit on Amavasya | Short on Amavasya → Exit on Purnima")
-    print("Stop Loss: Initial 50 points, Trail by 25 points for every 75 points profit")
+    print(f"Stop Loss: Initial {initial_sl} points, Trail by {params['trail_step']} points "
+          f"for every {params['trail_frequency']} points profit")
     print("Enhancement: Tracking Sun Sign (monthly trend)")
     print("Stop Loss Logic: Uses intraday High/Low prices for accurate SL detection")
     
@@ -282,7 +348,7 @@ def implement_trading_strategy(nifty_df, purnima_df, amavasya_df):
                 entry_date = actual_date
                 entry_type = event_type
                 entry_sun_sign = sun_sign
-                stop_loss = entry_price - 50  # initial_sl
+                stop_loss = entry_price - initial_sl
                 
             elif event_type == 'Amavasya':
                 # Go Short on Amavasya
@@ -291,7 +357,7 @@ def implement_trading_strategy(nifty_df, purnima_df, amavasya_df):
                 entry_date = actual_date
                 entry_type = event_type
                 entry_sun_sign = sun_sign
-                stop_loss = entry_price + 50  # initial_sl
+                stop_loss = entry_price + initial_sl
                 
         else:
             # Check if we should exit current position
@@ -300,7 +366,7 @@ def implement_trading_strategy(nifty_df, purnima_df, amavasya_df):
             
             # First check if stop loss was hit before this astrology event
             sl_price, sl_date, sl_status = check_stop_loss(nifty_df, entry_date, entry_price, 
-                                                         current_position, stop_loss)
+                                                         current_position, stop_loss, params)
             
             if sl_status == 'SL_Hit' and sl_date < actual_date:
                 # Stop loss was hit before astrology exit
@@ -341,7 +407,10 @@ def implement_trading_strategy(nifty_df, purnima_df, amavasya_df):
                     'Exit_Reason': exit_reason,
                     'Days_Held': (exit_date - entry_date).days
                 }
-                trades.append(trade)
+                if sink is not None:
+                    sink.add(trade)
+                else:
+                    trades.append(trade)
                 
                 # Reset position
                 current_position = None
@@ -359,14 +428,14 @@ def implement_trading_strategy(nifty_df, purnima_df, amavasya_df):
                         entry_date = actual_date
                         entry_type = event_type
                         entry_sun_sign = sun_sign
-                        stop_loss = entry_price - 50
+                        stop_loss = entry_price - initial_sl
                     elif event_type == 'Amavasya':
                         current_position = 'Short'
                         entry_price = price
                         entry_date = actual_date
                         entry_type = event_type
                         entry_sun_sign = sun_sign
-                        stop_loss = entry_price + 50
+                        stop_loss = entry_price + initial_sl
                 elif exit_reason == 'Astrology_Exit':
                     # Enter opposite position immediately after astrology exit
                     if event_type == 'Purnima':
@@ -375,16 +444,17 @@ def implement_trading_strategy(nifty_df, purnima_df, amavasya_df):
                         entry_date = actual_date
                         entry_type = event_type
                         entry_sun_sign = sun_sign
-                        stop_loss = entry_price - 50
+                        stop_loss = entry_price - initial_sl
                     elif event_type == 'Amavasya':
                         current_position = 'Short'
                         entry_price = price
                         entry_date = actual_date
                         entry_type = event_type
                         entry_sun_sign = sun_sign
-                        stop_loss = entry_price + 50
+                        stop_loss = entry_price + initial_sl
     
-    print(f"Completed strategy execution. Total trades: {len(trades)}")
+    total_trades = sink.total_trades if sink is not None else len(trades)
+    print(f"Completed strategy execution. Total trades: {total_trades}")
     return trades
 
 def analyze_zodiac_performance(trades_df):
@@ -406,6 +476,13 @@ def analyze_zodiac_performance(trades_df):
     sun_sign_analysis['Win_Rate'] = (trades_df.groupby('Entry_Sun_Sign')['PnL'].apply(lambda x: (x > 0).sum() / len(x) * 100)).round(2)
     sun_sign_analysis = sun_sign_analysis.sort_values('Total_PnL', ascending=False)
     
+    position_sun_analysis = trades_df.groupby(['Entry_Sun_Sign', 'Position'])['PnL'].agg(['count', 'sum', 'mean']).round(2)
+    
+    print_zodiac_tables(sun_sign_analysis, position_sun_analysis)
+    return sun_sign_analysis
+
+def print_zodiac_tables(sun_sign_analysis, position_sun_analysis):
+    """Print the sun sign tables, best/worst signs and position breakdown"""
     print(sun_sign_analysis)
     
     # Best and Worst Performing Signs
@@ -422,17 +499,14 @@ def analyze_zodiac_performance(trades_df):
     print("\n📊 POSITION TYPE ANALYSIS BY SUN SIGNS")
     print("-" * 60)
     
-    position_sun_analysis = trades_df.groupby(['Entry_Sun_Sign', 'Position'])['PnL'].agg(['count', 'sum', 'mean']).round(2)
     print("Sun Sign & Position Performance:")
     print(position_sun_analysis)
-    
-    return sun_sign_analysis
 
 def create_tradebook_and_summary(trades):
     """Create tradebook with sun sign analysis"""
     if not trades:
         print("No trades to analyze!")
-        return
+        return None, None
     
     # Convert to DataFrame
     trades_df = pd.DataFrame(trades)
@@ -441,21 +515,10 @@ def create_tradebook_and_summary(trades):
     total_trades = len(trades_df)
     winning_trades = len(trades_df[trades_df['PnL'] > 0])
     losing_trades = len(trades_df[trades_df['PnL'] < 0])
-    win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
     total_pnl = trades_df['PnL'].sum()
     avg_days_held = trades_df['Days_Held'].mean()
     
-    # Display results
-    print("\n" + "="*80)
-    print("TRADEBOOK SUMMARY")
-    print("="*80)
-    print(f"Total Trades: {total_trades}")
-    print(f"Winning Trades: {winning_trades}")
-    print(f"Losing Trades: {losing_trades}")
-    print(f"Win Rate: {win_rate:.2f}%")
-    print(f"Total P&L: {total_pnl:.2f} points")
-    print(f"Average P&L per Trade: {total_pnl/total_trades:.2f} points")
-    print(f"Average Days Held: {avg_days_held:.1f} days")
+    print_tradebook_totals(total_trades, winning_trades, losing_trades, total_pnl, avg_days_held)
     
     # Analyze zodiac performance
     sun_analysis = analyze_zodiac_performance(trades_df)
@@ -468,6 +531,54 @@ def create_tradebook_and_summary(trades):
     print(f"  - astrology_tradebook.csv (Detailed trades with sun sign info)")
     print(f"  - sun_sign_analysis.csv (Sun sign performance analysis)")
     
+    print_recent_trades(trades_df)
+    
+    return trades_df, sun_analysis
+
+def create_summary_from_sink(sink, analysis_path='sun_sign_analysis.csv'):
+    """Same report as create_tradebook_and_summary, from a streamed run's running totals"""
+    if sink.total_trades == 0:
+        print("No trades to analyze!")
+        return None
+    
+    print_tradebook_totals(sink.total_trades, sink.winning_trades, sink.losing_trades,
+                           sink.total_pnl, sink.total_days_held / sink.total_trades)
+    
+    print("\n" + "="*80)
+    print("SUN SIGN PERFORMANCE ANALYSIS")
+    print("="*80)
+    print("\n📅 SUN SIGN ANALYSIS (Monthly Trend - Sun stays 30 days in each sign)")
+    print("-" * 70)
+    sun_analysis = sink.sun_sign_analysis()
+    print_zodiac_tables(sun_analysis, sink.position_analysis())
+    
+    sun_analysis.to_csv(analysis_path)
+    print(f"\n💾 Files saved:")
+    print(f"  - {sink.path} (Detailed trades with sun sign info, streamed)")
+    print(f"  - {analysis_path} (Sun sign performance analysis)")
+    
+    print_recent_trades(sink.recent_trades())
+    
+    return sun_analysis
+
+def print_tradebook_totals(total_trades, winning_trades, losing_trades, total_pnl, avg_days_held):
+    """Print the headline tradebook metrics"""
+    win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
+    
+    # Display results
+    print("\n" + "="*80)
+    print("TRADEBOOK SUMMARY")
+    print("="*80)
+    print(f"Total Trades: {total_trades}")
+    print(f"Winning Trades: {winning_trades}")
+    print(f"Losing Trades: {losing_trades}")
+    print(f"Win Rate: {win_rate:.2f}%")
+    print(f"Total P&L: {total_pnl:.2f} points")
+    print(f"Average P&L per Trade: {total_pnl/total_trades:.2f} points")
+    print(f"Average Days Held: {avg_days_held:.1f} days")
+
+def print_recent_trades(trades_df):
+    """Print the last 10 trades with sun sign info"""
     # Display recent trades with zodiac info
     print("\n" + "="*80)
     print("RECENT TRADES WITH SUN SIGN INFORMATION")
@@ -479,39 +590,137 @@ def create_tradebook_and_summary(trades):
     display_cols = ['Entry_Date', 'Entry_Type', 'Entry_Price', 'Entry_Sun_Sign', 
                    'Exit_Date', 'Exit_Price', 'Position', 'PnL', 'Days_Held']
     print(trades_df[display_cols].tail(10).to_string(index=False))
-    
-    return trades_df
 
-def main():
-    """Main function to run the trading strategy"""
-    print("🌙✨ ASTROLOGY TRADING STRATEGY ✨🌕")
-    print("Strategy: Long on Purnima, Short on Amavasya")
-    print("Enhancement: Tracking Sun Signs (Monthly trend)")
-    print("Stop Loss: 50 points initial, trail by 25 for every 75 points profit")
-    print("SL Detection: Uses intraday High/Low for accurate stop loss hits")
+def print_cached_summary(trades_df, sun_analysis):
+    """Print a short summary for results served from the cache"""
+    total_trades = len(trades_df)
+    total_pnl = trades_df['PnL'].sum()
+    win_rate = (trades_df['PnL'] > 0).sum() / total_trades * 100 if total_trades > 0 else 0
+    
+    print("\n" + "="*80)
+    print("TRADEBOOK SUMMARY (cached)")
     print("="*80)
+    print(f"Total Trades: {total_trades}")
+    print(f"Win Rate: {win_rate:.2f}%")
+    print(f"Total P&L: {total_pnl:.2f} points")
+    print("\n📅 SUN SIGN ANALYSIS")
+    print(sun_analysis)
+
+def run_backtest(use_cache=True, stream=False, tradebook_path='astrology_tradebook.csv', batch_size=500,
+                 params=None):
+    """Run the strategy, reusing stored results when inputs, parameters and code are unchanged
+
+    params overrides STRATEGY_PARAMS; each distinct setting is cached separately.
+
+    With stream=True trades are written to tradebook_path in batches while the
+    strategy runs (CSV, or Parquet for a .parquet path) and the summary comes
+    from running totals. The full tradebook is never held in memory, so the
+    returned trades_df is None and the result cache is not used.
+    """
+    if stream:
+        use_cache = False
+    cache = ResultCache()
+    # Lunar CSVs are optional (the ephemeris fills them in), so key on whichever exist
+    input_files = [path for path in INPUT_FILES if os.path.exists(path)]
+    code_files = [os.path.abspath(__file__), os.path.abspath(ephemeris.__file__)]
+    params = {**STRATEGY_PARAMS, **(params or {})}
+    cache_key = make_key(input_files, params, code_files) if use_cache else None
+    
+    cached = cache.get(cache_key)
+    if cached is not None:
+        print("\n⚡ Cache hit: reusing results from an identical earlier run")
+        trades_df, sun_analysis = cached['tradebook'], cached['sun_sign_analysis']
+        print_cached_summary(trades_df, sun_analysis)
+        # The CSVs on disk may be from a different run, so always rewrite them
+        trades_df.to_csv('astrology_tradebook.csv', index=False)
+        sun_analysis.to_csv('sun_sign_analysis.csv')
+        return trades_df, sun_analysis
     
     # Load data
     nifty_df, purnima_df, amavasya_df = load_and_clean_data()
     
     if nifty_df is None:
         print("❌ Failed to load required data files.")
-        print("Please ensure the following files are present:")
-        print("  - NIFTY 50.csv")
-        print("  - poornima.csv") 
-        print("  - amavasya.csv")
-        return
+        print("Please ensure NIFTY 50.csv is present")
+        print("(poornima.csv and amavasya.csv are optional; missing dates are computed)")
+        return None, None
     
     # Run the trading strategy
     print("\n🚀 Executing trading strategy...")
-    trades = implement_trading_strategy(nifty_df, purnima_df, amavasya_df)
+    if stream:
+        with TradebookSink(tradebook_path, batch_size=batch_size) as sink:
+            implement_trading_strategy(nifty_df, purnima_df, amavasya_df, sink=sink, params=params)
+        if sink.total_trades == 0:
+            print("❌ No trades were executed. Please check your data.")
+            return None, None
+        return None, create_summary_from_sink(sink)
+    
+    trades = implement_trading_strategy(nifty_df, purnima_df, amavasya_df, params=params)
     
     if not trades:
         print("❌ No trades were executed. Please check your data.")
-        return
+        return None, None
     
     # Create tradebook and analysis
-    trades_df = create_tradebook_and_summary(trades)
+    trades_df, sun_analysis = create_tradebook_and_summary(trades)
+    cache.put(cache_key, {'tradebook': trades_df, 'sun_sign_analysis': sun_analysis})
+    
+    return trades_df, sun_analysis
+
+@perf.timed("run_event_study")
+def run_event_study(horizons=20, direction='long', output_path='lunar_event_study.csv'):
+    """Event-study mode: outcome distribution 1..horizons trading days after each lunar event
+
+    Builds forward return, MFE and MAE matrices for all events at once and
+    groups them by event type and sun sign, instead of simulating one path.
+    """
+    nifty_df, purnima_df, amavasya_df = load_and_clean_data()
+    if nifty_df is None:
+        print("❌ Failed to load required data files.")
+        return None
+    
+    events = event_study.collect_events(purnima_df, amavasya_df)
+    events_df, matrices = event_study.build_event_matrix(nifty_df, events, horizons, direction)
+    summary = event_study.summarize(events_df, matrices)
+    summary.to_csv(output_path)
+    
+    print("\n" + "="*80)
+    print(f"LUNAR EVENT STUDY ({len(events_df)} events, horizons 1-{horizons} trading days, {direction})")
+    print("="*80)
+    by_event = event_study.summarize(events_df, matrices, by=('Event',))
+    shown = [h for h in (1, 5, 10, 20) if h <= horizons]
+    print(by_event[by_event.index.get_level_values('Horizon').isin(shown)])
+    print(f"\n💾 Saved per event type & sun sign breakdown to {output_path}")
+    
+    return summary
+
+def main():
+    """Main function to run the trading strategy (or the event study with --event-study)"""
+    parser = argparse.ArgumentParser(description="Astrology trading strategy backtest")
+    parser.add_argument("--event-study", action="store_true",
+                        help="summarize outcomes after every lunar event instead of running the backtest")
+    parser.add_argument("--horizons", type=int, default=20, help="event study horizons, 1..N trading days")
+    parser.add_argument("--direction", choices=["long", "strategy"], default="long",
+                        help="'strategy' measures Amavasya events from the short side")
+    parser.add_argument("--out", default="lunar_event_study.csv", help="event study output file")
+    args = parser.parse_args()
+    
+    if args.event_study:
+        print("🌙✨ LUNAR EVENT STUDY ✨🌕")
+        run_event_study(args.horizons, args.direction, args.out)
+        return
+    
+    print("🌙✨ ASTROLOGY TRADING STRATEGY ✨🌕")
+    print("Strategy: Long on Purnima, Short on Amavasya")
+    print("Enhancement: Tracking Sun Signs (Monthly trend)")
+    print(f"Stop Loss: {STRATEGY_PARAMS['initial_sl']} points initial, trail by {STRATEGY_PARAMS['trail_step']} "
+          f"for every {STRATEGY_PARAMS['trail_frequency']} points profit")
+    print("SL Detection: Uses intraday High/Low for accurate stop loss hits")
+    print("="*80)
+    
+    trades_df, sun_analysis = run_backtest()
+    if sun_analysis is None:
+        return
     
     print("\n✅ Analysis complete!")
     print("📊 Check the generated CSV files for detailed sun sign performance analysis.")
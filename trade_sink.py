@@ -0,0 +1,146 @@
+"""Streaming tradebook writer with running sun-sign aggregates.
+
+Trades are buffered and appended to disk every batch_size trades, so memory
+stays bounded and a crashed run keeps everything flushed so far. Per-sign
+count, sum, sum of squares, wins and days held are kept as running totals so
+the sun-sign analysis never needs the full tradebook in memory.
+
+CSV output is appended batch by batch. Parquet output (needs pyarrow) is
+written as one row group per batch and is only readable once closed.
+"""
+import os
+from collections import deque
+import numpy as np
+import pandas as pd
+
+
+class TradebookSink:
+    """Batching trade writer; use as a context manager or call close()."""
+
+    def __init__(self, path='astrology_tradebook.csv', batch_size=500, fmt=None, keep_recent=10):
+        self.path = path
+        self.batch_size = batch_size
+        self.fmt = fmt or ('parquet' if path.endswith('.parquet') else 'csv')
+        if self.fmt not in ('csv', 'parquet'):
+            raise ValueError("fmt must be 'csv' or 'parquet'")
+
+        self.columns = None
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.total_pnl = 0.0
+        self.total_days_held = 0
+
+        self._buffer = []
+        self._recent = deque(maxlen=keep_recent)
+        self._by_sign = {}      # sign -> [count, sum, sum_sq, wins, days_held_sum]
+        self._by_position = {}  # (sign, position) -> [count, sum]
+        self._written = False
+        self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def add(self, trade):
+        """Record one trade dict and flush if the batch is full"""
+        if self.columns is None:
+            self.columns = list(trade.keys())
+        pnl = trade['PnL']
+        days = trade['Days_Held']
+        sign = trade['Entry_Sun_Sign']
+
+        self.total_trades += 1
+        self.total_pnl += pnl
+        self.total_days_held += days
+        if pnl > 0:
+            self.winning_trades += 1
+        elif pnl < 0:
+            self.losing_trades += 1
+
+        stats = self._by_sign.setdefault(sign, [0, 0.0, 0.0, 0, 0])
+        stats[0] += 1
+        stats[1] += pnl
+        stats[2] += pnl * pnl
+        stats[3] += pnl > 0
+        stats[4] += days
+
+        pos_stats = self._by_position.setdefault((sign, trade['Position']), [0, 0.0])
+        pos_stats[0] += 1
+        pos_stats[1] += pnl
+
+        self._buffer.append(trade)
+        self._recent.append(trade)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered trades to disk"""
+        if not self._buffer:
+            return
+        batch = pd.DataFrame(self._buffer, columns=self.columns)
+        self._buffer = []
+
+        if self.fmt == 'csv':
+            # The first flush truncates any tradebook left from an earlier run
+            batch.to_csv(self.path, mode='a' if self._written else 'w',
+                         header=not self._written, index=False)
+        else:
+            self._write_parquet(batch)
+        self._written = True
+
+    def _write_parquet(self, batch):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from e
+        table = pa.Table.from_pandas(batch, preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+        self._parquet_writer.write_table(table.cast(self._parquet_writer.schema))
+
+    def close(self):
+        """Flush remaining trades and finalize the file"""
+        self.flush()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if not self._written and os.path.exists(self.path):
+            # No trades at all: don't leave a stale tradebook from a previous run
+            os.remove(self.path)
+
+    def recent_trades(self):
+        """The last keep_recent trades as a DataFrame"""
+        return pd.DataFrame(list(self._recent), columns=self.columns)
+
+    def sun_sign_analysis(self, include_std=False):
+        """Same table as analyze_zodiac_performance, built from the running totals"""
+        rows = {}
+        for sign, (count, total, sum_sq, wins, days) in self._by_sign.items():
+            row = {
+                'Total_Trades': count,
+                'Total_PnL': total,
+                'Avg_PnL': total / count,
+                'Avg_Days_Held': days / count,
+            }
+            if include_std:
+                # Sample standard deviation from sum and sum of squares
+                var = (sum_sq - total * total / count) / (count - 1) if count > 1 else np.nan
+                row['Std_PnL'] = np.sqrt(max(var, 0.0)) if count > 1 else np.nan
+            row['Win_Rate'] = wins / count * 100
+            rows[sign] = row
+
+        analysis = pd.DataFrame.from_dict(rows, orient='index').round(2)
+        analysis.index.name = 'Entry_Sun_Sign'
+        return analysis.sort_values('Total_PnL', ascending=False)
+
+    def position_analysis(self):
+        """Count, sum and mean P&L per (sun sign, position)"""
+        index = pd.MultiIndex.from_tuples(sorted(self._by_position), names=['Entry_Sun_Sign', 'Position'])
+        counts = np.array([self._by_position[key][0] for key in index])
+        sums = np.array([self._by_position[key][1] for key in index])
+        return pd.DataFrame({'count': counts, 'sum': sums, 'mean': sums / counts}, index=index).round(2)
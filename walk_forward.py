@@ -0,0 +1,248 @@
+"""Walk-forward (rolling train/test) evaluation of the astrology strategy.
+
+The Nifty history is split into rolling windows. On each train window the
+strategy is run and sun signs are ranked by total P&L; the best sign is then
+scored out-of-sample on the following test window. Folds run concurrently in
+a process pool. The OHLC prices and dates are placed once in shared memory
+and every worker reads the same read-only arrays instead of a pickled copy.
+"""
+import io
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+import sun_moon4
+
+PRICE_NAMES = ('open', 'high', 'low', 'close')
+
+# Every fold row has these columns; unscored folds leave the scores as NaN
+FOLD_COLUMNS = [
+    'Fold', 'Train_Start', 'Train_End', 'Test_Start', 'Test_End', 'Best_Sun_Sign',
+    'Train_Trades', 'Train_Best_Trades', 'Train_Best_PnL', 'Test_All_Trades', 'Test_All_PnL',
+    'Test_Best_Trades', 'Test_Best_PnL', 'Test_Best_Win_Rate',
+]
+
+# Per-process views onto the shared arrays, set by _attach()
+_shared = {}
+
+
+def price_columns(nifty_df):
+    """OHLC columns in nifty_df, matched the way the strategy code matches them"""
+    columns = []
+    for name in PRICE_NAMES:
+        for col in nifty_df.columns:
+            if name in col.lower() and col not in columns:
+                columns.append(col)
+                break
+    return columns
+
+
+def make_folds(dates, train_years=3, test_months=6):
+    """Rolling (train_start, train_end, test_start, test_end) windows, end-exclusive"""
+    first, last = pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])
+    folds = []
+    train_start = first
+    while True:
+        train_end = train_start + pd.DateOffset(years=train_years)
+        test_end = train_end + pd.DateOffset(months=test_months)
+        if train_end > last:
+            break
+        folds.append((train_start, train_end, train_end, min(test_end, last + pd.Timedelta(days=1))))
+        train_start = train_start + pd.DateOffset(months=test_months)
+    return folds
+
+
+def _attach(prices_name, dates_name, n_rows, columns):
+    """Pool initializer: map the shared OHLC and date arrays into this process"""
+    prices_shm = shared_memory.SharedMemory(name=prices_name)
+    dates_shm = shared_memory.SharedMemory(name=dates_name)
+    prices = np.ndarray((n_rows, len(columns)), dtype=np.float64, buffer=prices_shm.buf)
+    dates = np.ndarray((n_rows,), dtype='datetime64[D]', buffer=dates_shm.buf)
+    prices.flags.writeable = False
+    dates.flags.writeable = False
+    # Keep the SharedMemory objects alive for as long as the views are used
+    _shared.update(prices=prices, dates=dates, columns=columns, handles=(prices_shm, dates_shm))
+
+
+def _window_frame(start, end):
+    """Nifty frame for [start, end) rebuilt from the shared arrays"""
+    dates = _shared['dates']
+    lo, hi = np.searchsorted(dates, [np.datetime64(start.date()), np.datetime64(end.date())])
+    frame = pd.DataFrame(_shared['prices'][lo:hi], columns=_shared['columns'])
+    day_list = dates[lo:hi].astype(object)
+    frame['Date'] = day_list
+    frame['Sun_Sign'] = [sun_moon4.get_zodiac_sign(d) for d in day_list]
+    return frame
+
+
+def _events_in(events, start, end):
+    mask = (events >= start.date()) & (events < end.date())
+    return pd.DataFrame({'Date': events[mask]})
+
+
+def _run_window(start, end, purnima, amavasya):
+    """Strategy trades for one window, with the per-run console output silenced"""
+    nifty = _window_frame(start, end)
+    if nifty.empty:
+        return pd.DataFrame()
+    with contextlib.redirect_stdout(io.StringIO()):
+        trades = sun_moon4.implement_trading_strategy(
+            nifty, _events_in(purnima, start, end), _events_in(amavasya, start, end))
+    return pd.DataFrame(trades)
+
+
+def evaluate_fold(args):
+    """Fit the best sun sign on the train window and score it on the test window"""
+    fold, (train_start, train_end, test_start, test_end), purnima, amavasya, min_trades = args
+    result = dict.fromkeys(FOLD_COLUMNS, np.nan)
+    result.update({
+        'Fold': fold,
+        'Train_Start': train_start.date(), 'Train_End': train_end.date(),
+        'Test_Start': test_start.date(), 'Test_End': test_end.date(),
+        'Best_Sun_Sign': None,
+    })
+
+    train = _run_window(train_start, train_end, purnima, amavasya)
+    if train.empty:
+        return {**result, 'Train_Trades': 0}
+    by_sign = train.groupby('Entry_Sun_Sign')['PnL'].agg(['count', 'sum'])
+    by_sign = by_sign[by_sign['count'] >= min_trades].sort_values('sum', ascending=False)
+    if by_sign.empty:
+        return {**result, 'Train_Trades': len(train)}
+    best_sign = by_sign.index[0]
+
+    test = _run_window(test_start, test_end, purnima, amavasya)
+    chosen = test[test['Entry_Sun_Sign'] == best_sign] if not test.empty else test
+    return {
+        **result,
+        'Best_Sun_Sign': best_sign,
+        'Train_Trades': len(train),
+        'Train_Best_Trades': int(by_sign.iloc[0]['count']),
+        'Train_Best_PnL': float(by_sign.iloc[0]['sum']),
+        'Test_All_Trades': len(test),
+        'Test_All_PnL': float(test['PnL'].sum()) if not test.empty else 0.0,
+        'Test_Best_Trades': len(chosen),
+        'Test_Best_PnL': float(chosen['PnL'].sum()) if not chosen.empty else 0.0,
+        'Test_Best_Win_Rate': float((chosen['PnL'] > 0).mean() * 100) if not chosen.empty else np.nan,
+    }
+
+
+def aggregate(folds_df):
+    """Out-of-sample totals across all scored folds (NaN scores when none scored)"""
+    scored = folds_df.dropna(subset=['Best_Sun_Sign'])
+    if scored.empty:
+        return {
+            'Folds': len(folds_df),
+            'Scored_Folds': 0,
+            'OOS_Trades': 0,
+            'OOS_PnL': np.nan,
+            'OOS_Win_Rate': np.nan,
+            'Positive_Folds_Pct': np.nan,
+            'In_Sample_PnL_Per_Trade': np.nan,
+            'OOS_PnL_Per_Trade': np.nan,
+            'Baseline_All_Signs_OOS_PnL': np.nan,
+        }
+    trades = scored['Test_Best_Trades'].sum()
+    wins = (scored['Test_Best_Win_Rate'].fillna(0) * scored['Test_Best_Trades'] / 100).sum()
+    return {
+        'Folds': len(folds_df),
+        'Scored_Folds': len(scored),
+        'OOS_Trades': int(trades),
+        'OOS_PnL': float(scored['Test_Best_PnL'].sum()),
+        'OOS_Win_Rate': float(wins / trades * 100) if trades else np.nan,
+        'Positive_Folds_Pct': float((scored['Test_Best_PnL'] > 0).mean() * 100) if len(scored) else np.nan,
+        'In_Sample_PnL_Per_Trade': float(scored['Train_Best_PnL'].sum() / scored['Train_Best_Trades'].sum())
+        if len(scored) else np.nan,
+        'OOS_PnL_Per_Trade': float(scored['Test_Best_PnL'].sum() / trades) if trades else np.nan,
+        'Baseline_All_Signs_OOS_PnL': float(scored['Test_All_PnL'].sum()),
+    }
+
+
+def walk_forward(nifty_df, purnima_df, amavasya_df, train_years=3, test_months=6,
+                 workers=None, min_trades=2):
+    """Run every fold (in parallel unless workers == 1); returns (folds_df, summary)"""
+    nifty = nifty_df.sort_values('Date')
+    columns = price_columns(nifty)
+    prices = np.ascontiguousarray(nifty[columns].to_numpy(dtype=np.float64))
+    dates = pd.to_datetime(nifty['Date']).to_numpy(dtype='datetime64[D]')
+    purnima = np.array(sorted(purnima_df['Date'].dropna()), dtype=object)
+    amavasya = np.array(sorted(amavasya_df['Date'].dropna()), dtype=object)
+
+    folds = make_folds(dates, train_years, test_months)
+    jobs = [(i + 1, fold, purnima, amavasya, min_trades) for i, fold in enumerate(folds)]
+
+    prices_shm = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+    dates_shm = shared_memory.SharedMemory(create=True, size=max(dates.nbytes, 1))
+    try:
+        np.ndarray(prices.shape, dtype=prices.dtype, buffer=prices_shm.buf)[:] = prices
+        np.ndarray(dates.shape, dtype=dates.dtype, buffer=dates_shm.buf)[:] = dates
+        init_args = (prices_shm.name, dates_shm.name, len(prices), columns)
+
+        if workers == 1:
+            _attach(*init_args)
+            try:
+                results = [evaluate_fold(job) for job in jobs]
+            finally:
+                _shared.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=init_args) as pool:
+                results = list(pool.map(evaluate_fold, jobs))
+    finally:
+        prices_shm.close()
+        prices_shm.unlink()
+        dates_shm.close()
+        dates_shm.unlink()
+
+    folds_df = pd.DataFrame(results, columns=FOLD_COLUMNS)
+    return folds_df, aggregate(folds_df) if not folds_df.empty else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward evaluation of the astrology strategy")
+    parser.add_argument("--train-years", type=int, default=3)
+    parser.add_argument("--test-months", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (1 = serial)")
+    parser.add_argument("--min-trades", type=int, default=2, help="train trades a sign needs to be picked")
+    parser.add_argument("--out", default="walk_forward_folds.csv")
+    args = parser.parse_args()
+
+    nifty_df, purnima_df, amavasya_df = sun_moon4.load_and_clean_data()
+    if nifty_df is None:
+        print("❌ Failed to load required data files.")
+        return
+
+    print(f"\n🔁 Walk-forward: {args.train_years}y train / {args.test_months}m test windows")
+    t0 = time.perf_counter()
+    folds_df, summary = walk_forward(nifty_df, purnima_df, amavasya_df, args.train_years,
+                                     args.test_months, args.workers, args.min_trades)
+    elapsed = time.perf_counter() - t0
+    if folds_df.empty:
+        print("❌ History is shorter than one train window.")
+        return
+
+    pd.set_option('display.max_columns', None)
+    pd.set_option('display.width', None)
+    print("\n" + "="*80)
+    print("PER-FOLD OUT-OF-SAMPLE RESULTS")
+    print("="*80)
+    print(folds_df[['Fold', 'Train_Start', 'Test_Start', 'Test_End', 'Best_Sun_Sign',
+                    'Train_Best_PnL', 'Test_Best_Trades', 'Test_Best_PnL', 'Test_All_PnL']].to_string(index=False))
+
+    print("\n" + "="*80)
+    print("AGGREGATE OUT-OF-SAMPLE REPORT")
+    print("="*80)
+    if summary['Scored_Folds'] == 0:
+        print(f"⚠️ No fold scored: no sun sign reached {args.min_trades} train trades in any "
+              f"{args.train_years}y window. Try a lower --min-trades or longer --train-years.")
+    for key, value in summary.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+
+    folds_df.to_csv(args.out, index=False)
+    print(f"\n💾 {len(folds_df)} folds saved to {args.out} ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()